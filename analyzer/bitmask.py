@@ -0,0 +1,77 @@
+# 📦 匯入模組
+import sys
+from pathlib import Path
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix, MAX_NUMBER
+from analyzer.range_segment import get_segments
+
+# 🎭 號碼位元遮罩：第 n 位（1~39）代表號碼 n，一期開獎可存成一個 64 位元整數
+ONE = np.uint64(1)
+ODD_MASK = np.uint64(sum(1 << n for n in range(1, MAX_NUMBER + 1, 2)))
+SEGMENT_MASKS = np.array([
+    sum(1 << n for n in range(1, MAX_NUMBER + 1) if get_segments(n) == segment)
+    for segment in range(1, 5)
+], dtype=np.uint64)
+
+
+# 🎭 (..., 5) 號碼 → (...) uint64 遮罩
+def numbers_to_masks(numbers):
+    bits = np.left_shift(ONE, np.asarray(numbers, dtype=np.uint64))
+    return np.bitwise_or.reduce(bits, axis=-1)
+
+
+# 🎫 單張號碼 → uint64 遮罩
+def ticket_mask(numbers):
+    return np.uint64(sum(1 << int(n) for n in numbers))
+
+
+# 🔓 遮罩 → 升冪號碼
+def mask_to_numbers(mask):
+    mask = int(mask)
+    return [n for n in range(1, MAX_NUMBER + 1) if mask >> n & 1]
+
+
+# 🔢 uint64 位元計數（numpy 2 起有 bitwise_count，舊版以 SWAR 計算）
+def popcount64(values):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    v = np.asarray(values, dtype=np.uint64)
+    v = v - ((v >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    v = (v & np.uint64(0x3333333333333333)) + ((v >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    v = (v + (v >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((v * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.uint8)
+
+
+# 🎯 每期與指定號碼相同的個數：popcount(draw & ticket)
+def match_counts(masks, ticket):
+    return popcount64(masks & ticket_mask(ticket))
+
+
+# 🔗 每期連號組數：相鄰號碼在遮罩中為相鄰位元
+def consecutive_pairs(masks):
+    return popcount64(masks & (masks >> ONE))
+
+
+# ⚖️ 每期奇數個數
+def odd_counts(masks):
+    return popcount64(masks & ODD_MASK)
+
+
+# 📊 每期各區段號碼數，回傳 (N, 4)
+def segment_counts(masks):
+    return popcount64(np.asarray(masks)[..., None] & SEGMENT_MASKS)
+
+
+# 🧪 測試執行
+if __name__ == "__main__":
+    matrix = load_draw_matrix()
+    ticket = [int(n) for n in matrix.numbers[-1]]
+    counts = np.bincount(match_counts(matrix.masks, ticket), minlength=6)
+    print(f"🎫 以最新一期 {ticket} 比對全部 {len(matrix)} 期：")
+    for hits in range(6):
+        print(f"  中 {hits} 碼：{counts[hits]} 期")
@@ -1,33 +1,104 @@
-import streamlit as st
+import sys
+from pathlib import Path
+from datetime import datetime
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+import streamlit as st
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import NUMBERS_PER_DRAW, WEEKDAY_NAMES
+from analyzer.prefix_index import get_prefix_index
+
+# 📐 A3 版面：36 列 × 4 組，每組 8 欄（月、日、星期、號碼1~5），由上而下、由左而右排列
+GRID_ROWS, GRID_GROUPS = 36, 4
+GRID_SIZE = GRID_ROWS * GRID_GROUPS
+GROUP_FIELDS = ["月", "日", "星期"] + [f"號碼{i}" for i in range(1, NUMBERS_PER_DRAW + 1)]
+GROUP_WIDTH = len(GROUP_FIELDS)
+COLUMN_NAMES = [f"{field}{g}" if i < 3 else f"{field}_{g}" for g in range(1, GRID_GROUPS + 1) for i, field in enumerate(GROUP_FIELDS)]
+GROUP_COLORS = ["#fef3c7", "#e0f2fe", "#ede9fe", "#dcfce7"]
+DEFAULT_QUERY_COLORS = ["#fca5a5", "#fdba74", "#fcd34d", "#86efac", "#93c5fd"]
+
+
+# 🧱 建立 36 × 32 的格子：文字內容與號碼值（非號碼欄為 0，用於比對查詢號碼）
+def build_calendar_grid(matrix, start, end):
+    count = end - start
+    dates = matrix.dates[start:end]
+    months = dates.astype("datetime64[M]")
+    month_values = months.astype(np.int64) % 12 + 1
+    day_values = (dates - months.astype("datetime64[D]")).astype(np.int64) + 1
+
+    values = np.zeros((GRID_SIZE, GROUP_WIDTH), dtype=np.int64)
+    values[:count, 0] = month_values
+    values[:count, 1] = day_values
+    values[:count, 3:] = np.sort(matrix.numbers[start:end], axis=1)
+
+    text = np.char.zfill(values.astype(str), 2).astype(object)
+    text[:count, 2] = np.array(WEEKDAY_NAMES, dtype=object)[matrix.weekdays[start:end]]
+    text[count:] = ""
+
+    # (144, 8) → (4 組, 36 列, 8) → (36 列, 4 組, 8) → (36, 32)
+    def to_grid(cells):
+        return cells.reshape(GRID_GROUPS, GRID_ROWS, GROUP_WIDTH).transpose(1, 0, 2).reshape(GRID_ROWS, -1)
+
+    numbers = values.copy()
+    numbers[:, :3] = 0
+    return to_grid(text), to_grid(numbers)
+
+
+# 🎨 每格樣式：查詢號碼以指定顏色標示，其餘各組的月 / 日 / 星期欄套用底色
+def build_calendar_styles(number_grid, queries):
+    group_style = np.array([f"background-color: {color}" for color in GROUP_COLORS], dtype=object)
+    base = np.full((GRID_GROUPS, GROUP_WIDTH), "", dtype=object)
+    base[:, :3] = group_style[:, None]
+    styles = np.broadcast_to(base.reshape(1, -1), number_grid.shape).copy()
+
+    if queries:
+        lookup = np.full(40, "", dtype=object)
+        for number, color in queries:
+            lookup[number] = f"background-color: {color}"
+        hit = np.isin(number_grid, [number for number, _ in queries])
+        styles[hit] = lookup[number_grid[hit]]
+    return styles
+
+
+# 🔢 解析查詢號碼輸入，回傳 [(號碼, 顏色), ...]
+def parse_queries(query_values, query_colors):
+    queries, used_values = [], set()
+    for qval_raw, color in zip(query_values, query_colors):
+        qval = qval_raw.strip()
+        if not qval:
+            continue
+        if not qval.isdigit() or not (1 <= int(qval) <= 39):
+            st.warning(f"⚠️ 查詢號碼 {qval_raw} 僅能輸入 1~39 的整數")
+            continue
+        if int(qval) in used_values:
+            st.warning(f"⚠️ 查詢號碼 {qval.zfill(2)} 輸入重複，請移除重複值")
+            continue
+        used_values.add(int(qval))
+        queries.append((int(qval), color))
+    return queries
 
-def get_full_date_range(data):
-    df = pd.DataFrame(data, columns=["期別", "開獎日期", "星期", "號碼1", "號碼2", "號碼3", "號碼4", "號碼5"])
-    df["開獎日期"] = pd.to_datetime(df["開獎日期"])
-    return df["開獎日期"].min().date(), df["開獎日期"].max().date()
 
-def show_calendar_style_table(data):
+def show_calendar_style_table(matrix):
     st.subheader("\U0001F4CB 月曆式開獎紀錄（A3 格式模擬）")
 
     with st.expander("\U0001F50D 開獎號碼查詢條件（最多輸入 5 組）"):
         col_query = st.columns(5)
-        query_colors = ["#fca5a5", "#fdba74", "#fcd34d", "#86efac", "#93c5fd"]
         query_values = []
         for i in range(5):
             val = col_query[i].text_input(f"查詢號碼 {i+1}", key=f"query_{i}").strip()
             if val and (not val.isdigit() or not (1 <= int(val) <= 39)):
                 st.warning(f"⚠️ 查詢號碼 {i+1} 僅能輸入 1~39 的整數")
             query_values.append(val)
-        query_colors = [col_query[i].color_picker("選擇顏色", query_colors[i], key=f"color_{i}") for i in range(5)]
+        query_colors = [col_query[i].color_picker("選擇顏色", DEFAULT_QUERY_COLORS[i], key=f"color_{i}") for i in range(5)]
 
-    full_start, full_end = get_full_date_range(data)
-    today = datetime.today().date()
-    default_end = min(today, full_end)
-    df_all = pd.DataFrame(data, columns=["期別", "開獎日期", "星期", "號碼1", "號碼2", "號碼3", "號碼4", "號碼5"])
-    df_all["開獎日期"] = pd.to_datetime(df_all["開獎日期"])
-    df_range = df_all[df_all["開獎日期"] <= pd.to_datetime(default_end)].sort_values(by="開獎日期", ascending=False).head(144)
-    default_start = df_range["開獎日期"].min().date()
+    # 日期區間 → 最近一頁（GRID_SIZE 期）的索引範圍，由前綴索引的二分搜尋取得
+    index = get_prefix_index(matrix)
+    full_start, full_end = matrix.dates[0].item(), matrix.dates[-1].item()
+    default_end = min(datetime.today().date(), full_end)
+    default_start = matrix.dates[index.last_draws(full_start, default_end, GRID_SIZE)[0]].item()
 
     col1, col2 = st.columns(2)
     user_start = col1.date_input("起始日期", value=default_start, min_value=full_start, max_value=default_end)
@@ -37,89 +108,22 @@ def show_calendar_style_table(data):
         st.warning("⚠️ 起始日不能大於結束日")
         return
 
-    df = pd.DataFrame(data, columns=["期別", "開獎日期", "星期", "號碼1", "號碼2", "號碼3", "號碼4", "號碼5"])
-    df["開獎日期"] = pd.to_datetime(df["開獎日期"])
-    df = df[(df["開獎日期"] >= pd.to_datetime(user_start)) & (df["開獎日期"] <= pd.to_datetime(user_end))].copy()
-    df = df.sort_values(by="開獎日期", ascending=False).head(144).sort_values(by="開獎日期").reset_index(drop=True)
-    user_start = df["開獎日期"].min().date()
-    user_end = df["開獎日期"].max().date()
-    df = df.sort_values(by="開獎日期").reset_index(drop=True)
-
-    df[["號碼1", "號碼2", "號碼3", "號碼4", "號碼5"]] = df[["號碼1", "號碼2", "號碼3", "號碼4", "號碼5"]].apply(pd.to_numeric, errors='coerce')
-    df[["號碼1", "號碼2", "號碼3", "號碼4", "號碼5"]] = df[["號碼1", "號碼2", "號碼3", "號碼4", "號碼5"]].apply(lambda row: sorted(row), axis=1, result_type='expand')
-    df["月"] = df["開獎日期"].dt.strftime("%m")
-    df["日"] = df["開獎日期"].dt.strftime("%d")
-    df = df[["月", "日", "星期", "號碼1", "號碼2", "號碼3", "號碼4", "號碼5"]].reset_index(drop=True)
-    df = df.head(144)
-
-    while len(df) < 144:
-        df.loc[len(df)] = ["" for _ in range(df.shape[1])]
-    df = df.iloc[:144]
-
-    table_rows = []
-    for row_index in range(36):
-        row_data = []
-        for col_group in range(4):
-            base_idx = row_index + 36 * col_group
-            row = df.iloc[base_idx]
-            group = [
-                row["月"], row["日"], row["星期"],
-                row["號碼1"], row["號碼2"], row["號碼3"], row["號碼4"], row["號碼5"]
-            ]
-            row_data.extend(group)
-        table_rows.append(row_data)
-
-    col_names = []
-    for i in range(1, 5):
-        col_names.extend([
-            f"月{i}", f"日{i}", f"星期{i}",
-            f"號碼1_{i}", f"號碼2_{i}", f"號碼3_{i}", f"號碼4_{i}", f"號碼5_{i}"
-        ])
-
-    final_table = pd.DataFrame(table_rows, columns=col_names).astype(str)
-    final_table = final_table.applymap(lambda v: v.zfill(2) if v.isdigit() else v)
-
-    highlight_style = pd.DataFrame("", index=final_table.index, columns=final_table.columns)
-    used_values = set()
-    for qval_raw, color in zip(query_values, query_colors):
-        if not qval_raw.strip():
-            continue
-
-        qval = qval_raw.strip().zfill(2)
-
-        if not qval.isdigit() or not (1 <= int(qval) <= 39):
-            st.warning(f"⚠️ 查詢號碼 {qval_raw} 僅能輸入 1~39 的整數")
-            continue
+    start, end = index.last_draws(user_start, user_end, GRID_SIZE)
+    if start == end:
+        st.info("⚠️ 所選期間沒有開獎資料")
+        return
 
-        if qval in used_values:
-            st.warning(f"⚠️ 查詢號碼 {qval} 輸入重複，請移除重複值")
-            continue
+    text_grid, number_grid = build_calendar_grid(matrix, start, end)
+    styles = build_calendar_styles(number_grid, parse_queries(query_values, query_colors))
 
-        used_values.add(qval)
-
-        for col in final_table.columns:
-            if not col.startswith(("月", "日", "星期")):
-                highlight_style.loc[final_table[col] == qval, col] = f"background-color: {color}"
-
-    styled = final_table.style.apply(
-        lambda df: pd.DataFrame(
-            [[
-                highlight_style.loc[df.index[row_idx], c] if highlight_style.loc[df.index[row_idx], c] else (
-                    "background-color: #fef3c7" if c.startswith(("月1", "日1", "星期1")) else
-                    "background-color: #e0f2fe" if c.startswith(("月2", "日2", "星期2")) else
-                    "background-color: #ede9fe" if c.startswith(("月3", "日3", "星期3")) else
-                    "background-color: #dcfce7" if c.startswith(("月4", "日4", "星期4")) else
-                    ""
-                ) for c in df.columns
-            ] for row_idx in range(len(df))],
-            columns=df.columns
-        ),
-        axis=None
-    ).set_properties(**{
+    final_table = pd.DataFrame(text_grid, columns=COLUMN_NAMES)
+    style_table = pd.DataFrame(styles, columns=COLUMN_NAMES)
+    styled = final_table.style.apply(lambda _: style_table, axis=None).set_properties(**{
         'text-align': 'center',
         'border': '1px solid black',
         'font-size': '9pt'
     })
 
-    st.markdown(f"### 今彩539（起始日：{user_start.strftime('%Y/%m/%d')}，結束日：{user_end.strftime('%Y/%m/%d')}）")
+    first_date, last_date = matrix.dates[start].item(), matrix.dates[end - 1].item()
+    st.markdown(f"### 今彩539（起始日：{first_date.strftime('%Y/%m/%d')}，結束日：{last_date.strftime('%Y/%m/%d')}）")
     st.dataframe(styled, use_container_width=True, height=1600)
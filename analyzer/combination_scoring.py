@@ -0,0 +1,122 @@
+# 📦 匯入模組
+import sys
+import time
+from math import comb
+from pathlib import Path
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix, MAX_NUMBER, NUMBERS_PER_DRAW
+from analyzer.cooccurrence import COMBINATION_POSITIONS, build_unrank_table, combination_rank, count_combinations
+from analyzer.bitmask import numbers_to_masks, consecutive_pairs, odd_counts, segment_counts
+
+COMBINATION_TOTAL = comb(MAX_NUMBER, NUMBERS_PER_DRAW)  # 575,757 組
+CHUNK_SIZE = 65536  # 每批評分的組合數，控制暫存陣列大小（約數 MB）
+
+# 🗂️ 全部組合（依 combination_rank 排序，第 r 列即編號 r）
+_ALL_COMBINATIONS = None
+
+
+def all_combinations():
+    global _ALL_COMBINATIONS
+    if _ALL_COMBINATIONS is None:
+        _ALL_COMBINATIONS = build_unrank_table(NUMBERS_PER_DRAW)
+    return _ALL_COMBINATIONS
+
+
+# 📋 所有組合的評分結果（各欄位皆為長度 575,757 的陣列，索引即組合編號）
+class ComboScores:
+    FIELDS = ("hits_3plus", "hits_4plus", "hits_5", "sum", "odd", "segments", "consecutive", "max_gap", "gap_signature")
+
+    def __init__(self, combos, fields, total_draws):
+        self.combos = combos
+        self.fields = fields
+        self.total_draws = total_draws
+
+    def __getitem__(self, name):
+        return self.fields[name]
+
+    # 🎫 單一組號碼的評分
+    def for_ticket(self, numbers):
+        rank = int(combination_rank(sorted(int(n) for n in numbers)))
+        return {name: int(values[rank]) for name, values in self.fields.items()}
+
+    # 🔝 依欄位排序取前 k 組
+    def top(self, field, k=10, ascending=False):
+        values = self.fields[field].astype(np.int64)
+        keys = values if ascending else -values
+        top = np.argpartition(keys, k - 1)[:k]
+        top = top[np.argsort(keys[top], kind="stable")]
+        return [(tuple(int(n) for n in self.combos[i]), int(values[i])) for i in top]
+
+
+# 🧮 分批評分（history_counts 為歷史三、四、五碼組合的出現次數）
+def _score_chunk(combos, history_counts):
+    triples, quads, quints = history_counts
+    combos = combos.astype(np.intp)
+
+    # 🎯 歷史命中：設某期與組合相同 m 碼，
+    #    Σ三碼子組合次數 = Σ C(m,3)，Σ四碼 = Σ C(m,4)，五碼 = Σ C(m,5)，反推剛好中 3/4/5 碼的期數
+    triple_sum = triples[combination_rank(combos[:, COMBINATION_POSITIONS[3]])].sum(axis=1, dtype=np.int64)
+    quad_sum = quads[combination_rank(combos[:, COMBINATION_POSITIONS[4]])].sum(axis=1, dtype=np.int64)
+    hit5 = quints[combination_rank(combos)].astype(np.int64)
+    hit4 = quad_sum - 5 * hit5
+    hit3 = triple_sum - 4 * hit4 - 10 * hit5
+
+    # 🎭 位元運算：奇數個數、連號組數、涵蓋區段數
+    masks = numbers_to_masks(combos)
+    segments = np.count_nonzero(segment_counts(masks), axis=1)
+
+    # 📐 間距型態：4 個相鄰差各佔 6 bits 打包成一個整數
+    gaps = np.diff(combos, axis=1)
+    signature = (gaps[:, 0] << 18) | (gaps[:, 1] << 12) | (gaps[:, 2] << 6) | gaps[:, 3]
+
+    return {
+        "hits_3plus": (hit3 + hit4 + hit5).astype(np.uint16),
+        "hits_4plus": (hit4 + hit5).astype(np.uint16),
+        "hits_5": hit5.astype(np.uint16),
+        "sum": combos.sum(axis=1).astype(np.uint8),
+        "odd": odd_counts(masks).astype(np.uint8),
+        "segments": segments.astype(np.uint8),
+        "consecutive": consecutive_pairs(masks).astype(np.uint8),
+        "max_gap": gaps.max(axis=1).astype(np.uint8),
+        "gap_signature": signature.astype(np.uint32),
+    }
+
+
+# 🚀 對全部 C(39,5) 組合評分
+def score_all_combinations(matrix=None, chunk_size=CHUNK_SIZE):
+    if matrix is None:
+        matrix = load_draw_matrix()
+    if "combo_scores" in matrix.derived:
+        return matrix.derived["combo_scores"]
+
+    history_counts = tuple(count_combinations(matrix.sorted_numbers, k) for k in (3, 4, 5))
+    combos = all_combinations()
+    dtypes = {"hits_3plus": np.uint16, "hits_4plus": np.uint16, "hits_5": np.uint16, "gap_signature": np.uint32}
+    fields = {name: np.empty(len(combos), dtype=dtypes.get(name, np.uint8)) for name in ComboScores.FIELDS}
+
+    for start in range(0, len(combos), chunk_size):
+        chunk = _score_chunk(combos[start:start + chunk_size], history_counts)
+        for name, values in chunk.items():
+            fields[name][start:start + chunk_size] = values
+
+    scores = ComboScores(combos, fields, len(matrix))
+    matrix.derived["combo_scores"] = scores
+    return scores
+
+
+# 🚀 主程式
+if __name__ == "__main__":
+    print(f"🎫 今彩539 全組合評分（共 {COMBINATION_TOTAL:,} 組）")
+    print("=" * 35)
+    started = time.perf_counter()
+    scores = score_all_combinations()
+    print(f"⏱️ 評分耗時：{time.perf_counter() - started:.2f} 秒（歷史 {scores.total_draws} 期）")
+
+    print("\n🔥 歷史中 3 碼以上次數最多的組合：")
+    for combo, count in scores.top("hits_3plus", 10):
+        print(f"  {' '.join(f'{n:02d}' for n in combo)} ➜ {count} 次")
@@ -1,35 +1,26 @@
 # 📦 匯入模組
-import sqlite3
+import sys
 from pathlib import Path
+import numpy as np
 
 # 📁 全域設定
-BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "lotto539.db"
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix
+from analyzer.bitmask import consecutive_pairs
 
 # 🔗 分析連號分布
-def analyze_consecutive_numbers():
-    total_consecutive_periods = 0
-    consecutive_count_distribution = {}
+def analyze_consecutive_numbers(matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
 
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT period, no1, no2, no3, no4, no5 FROM lotto539")
-        rows = cursor.fetchall()
+    counts = consecutive_pairs(matrix.masks).astype(np.intp)
+    total_consecutive_periods = int(np.count_nonzero(counts))
 
-    for row in rows:
-        period = row[0]
-        numbers = sorted(row[1:])
-        count = 0
-
-        for i in range(4):
-            if numbers[i] + 1 == numbers[i + 1]:
-                count += 1
-
-        if count > 0:
-            total_consecutive_periods += 1
-
-        # 累積出現次數分類
-        consecutive_count_distribution[count] = consecutive_count_distribution.get(count, 0) + 1
+    # 累積出現次數分類
+    distribution = np.bincount(counts)
+    consecutive_count_distribution = {count: int(n) for count, n in enumerate(distribution) if n > 0}
 
     return total_consecutive_periods, consecutive_count_distribution
 
@@ -0,0 +1,132 @@
+# 📦 匯入模組
+import sys
+from itertools import combinations
+from math import comb
+from pathlib import Path
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import DB_PATH, load_draw_matrix, build_incidence, MAX_NUMBER, NUMBERS_PER_DRAW
+
+# 🔢 組合數表：BINOM[a, b] = C(a, b)
+BINOM = np.array([[comb(a, b) for b in range(NUMBERS_PER_DRAW + 1)] for a in range(MAX_NUMBER + 1)], dtype=np.int64)
+TRIPLE_TOTAL = comb(MAX_NUMBER, 3)  # 9139 組三碼
+
+# 📍 一期 5 個號碼中取 k 個的位置組合
+COMBINATION_POSITIONS = {k: np.array(list(combinations(range(NUMBERS_PER_DRAW), k))) for k in range(1, NUMBERS_PER_DRAW + 1)}
+UPPER_ROWS, UPPER_COLS = np.triu_indices(MAX_NUMBER, k=1)
+
+
+# 🧮 組合編號（colex 排序）：升冪號碼 c0<c1<… 的編號為 Σ C(ci-1, i+1)，範圍 0 ~ C(39,k)-1
+def combination_rank(sorted_combos):
+    combos = np.asarray(sorted_combos, dtype=np.intp)
+    k = combos.shape[-1]
+    return BINOM[combos - 1, np.arange(1, k + 1)].sum(axis=-1)
+
+
+# 🔓 編號還原為號碼組合：第 r 列即編號 r 的 k 碼組合
+def build_unrank_table(k):
+    combos = np.array(list(combinations(range(1, MAX_NUMBER + 1), k)), dtype=np.uint8)
+    table = np.empty_like(combos)
+    table[combination_rank(combos)] = combos
+    return table
+
+TRIPLE_NUMBERS = build_unrank_table(3)
+
+
+# 🤝 39×39 同期次數矩陣（對角線為各號碼出現次數）
+def count_pairs(incidence):
+    hits = incidence.astype(np.int32)
+    return hits.T @ hits
+
+
+# 🤝 k 碼同期次數：每期取出所有 k 碼子組合編號後一次 bincount
+def count_combinations(sorted_numbers, k):
+    ranks = combination_rank(sorted_numbers[:, COMBINATION_POSITIONS[k]])
+    return np.bincount(ranks.ravel(), minlength=comb(MAX_NUMBER, k)).astype(np.int32)
+
+
+# 🤝 三碼同期次數（每期 10 組）
+def count_triples(sorted_numbers):
+    return count_combinations(sorted_numbers, 3)
+
+
+# 📊 同期組合統計
+class CooccurrenceCounts:
+    def __init__(self, pair_counts, triple_counts, total_draws):
+        self.pair_counts = pair_counts          # (39, 39) int32
+        self.triple_counts = triple_counts      # (9139,) int32，以 combination_rank 為索引
+        self.total_draws = total_draws
+
+    # ➕ 納入新開出的期數（增量更新）
+    def update(self, numbers):
+        numbers = np.sort(np.asarray(numbers, dtype=np.uint8).reshape(-1, NUMBERS_PER_DRAW), axis=1)
+        self.pair_counts += count_pairs(build_incidence(numbers))
+        self.triple_counts += count_triples(numbers)
+        self.total_draws += len(numbers)
+
+    def pair_count(self, a, b):
+        return int(self.pair_counts[a - 1, b - 1])
+
+    def triple_count(self, a, b, c):
+        return int(self.triple_counts[combination_rank(sorted((a, b, c)))])
+
+    # 🔥 同期次數最多的兩碼組合
+    def top_pairs(self, k=10):
+        values = self.pair_counts[UPPER_ROWS, UPPER_COLS]
+        top = _top_indices(values, k)
+        return [((int(UPPER_ROWS[i]) + 1, int(UPPER_COLS[i]) + 1), int(values[i])) for i in top]
+
+    # 🔥 同期次數最多的三碼組合
+    def top_triples(self, k=10):
+        top = _top_indices(self.triple_counts, k)
+        return [(tuple(int(n) for n in TRIPLE_NUMBERS[i]), int(self.triple_counts[i])) for i in top]
+
+
+# 🔝 取前 k 大的索引（argpartition 後只排序前 k 筆）
+def _top_indices(values, k):
+    k = min(k, len(values))
+    top = np.argpartition(-values, k - 1)[:k]
+    return top[np.argsort(-values[top], kind="stable")]
+
+
+# 🚀 依日期區間建立同期統計（不指定日期即為全部歷史）
+def build_cooccurrence(matrix=None, start_date=None, end_date=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
+
+    start = 0 if start_date is None else np.searchsorted(matrix.dates, np.datetime64(start_date, "D"), side="left")
+    end = len(matrix) if end_date is None else np.searchsorted(matrix.dates, np.datetime64(end_date, "D"), side="right")
+    return CooccurrenceCounts(
+        count_pairs(matrix.incidence[start:end]),
+        count_triples(matrix.sorted_numbers[start:end]),
+        int(end - start),
+    )
+
+
+# 💾 從累計統計讀取全部歷史的同期統計（匯入後只增量納入新期數）
+def load_cooccurrence(db_path=DB_PATH):
+    from analyzer.stats_cache import refresh_stats_cache
+
+    stats = refresh_stats_cache(db_path)
+    return CooccurrenceCounts(
+        np.array(stats["pair_counts"], dtype=np.int32).reshape(MAX_NUMBER, MAX_NUMBER),
+        np.array(stats["triple_counts"], dtype=np.int32),
+        stats["total_rows"],
+    )
+
+
+# 🚀 主程式
+if __name__ == "__main__":
+    counts = load_cooccurrence()
+    print(f"🤝 今彩539 同期組合分析（共 {counts.total_draws} 期）")
+    print("=" * 35)
+    print("🔥 最常同期開出的兩碼：")
+    for (a, b), count in counts.top_pairs(10):
+        print(f"  {a:02d}-{b:02d} ➜ {count} 次")
+    print("🔥 最常同期開出的三碼：")
+    for (a, b, c), count in counts.top_triples(10):
+        print(f"  {a:02d}-{b:02d}-{c:02d} ➜ {count} 次")
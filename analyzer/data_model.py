@@ -0,0 +1,67 @@
+# 📦 匯入模組
+import sys
+from pathlib import Path
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import DB_PATH, WEEKDAY_NAMES, db_fingerprint, load_draw_matrix
+
+
+# 🗃️ 介面用資料模型：開獎矩陣 + 各分頁需要的彙總值，建立後唯讀、可跨工作階段共用
+class LottoDataModel:
+    def __init__(self, matrix, fingerprint):
+        self.fingerprint = fingerprint
+        self.matrix = matrix
+        self.total_draws = len(matrix)
+        self.start_date = str(matrix.dates[0]) if len(matrix) else None
+        self.end_date = str(matrix.dates[-1]) if len(matrix) else None
+
+        hits = matrix.incidence.astype(np.int64)
+        self.number_counts = hits.sum(axis=0)                                   # (39,)
+        self.tail_counts = np.bincount((matrix.numbers % 10).ravel(), minlength=10)
+        self.odd = int(np.count_nonzero(matrix.numbers & 1))
+        self.even = int(matrix.numbers.size - self.odd)
+        # (7, 39) 各星期各號碼出現次數：星期 one-hot 轉置後乘上出現矩陣
+        self.weekday_number_counts = (matrix.weekdays[:, None] == np.arange(7)).T.astype(np.int64) @ hits
+        self.number_order = np.argsort(-self.number_counts, kind="stable")     # 次數由多到少
+        self._rows = None
+
+    # 🔥 出現次數最多的 k 個號碼 [(號碼, 次數), ...]
+    def top_numbers(self, k):
+        return [(int(i) + 1, int(self.number_counts[i])) for i in self.number_order[:k] if self.number_counts[i] > 0]
+
+    # ❄️ 出現次數最少的 k 個號碼（沿用 Counter.most_common()[-k:] 的順序）
+    def bottom_numbers(self, k):
+        appeared = [i for i in self.number_order if self.number_counts[i] > 0]
+        return [(int(i) + 1, int(self.number_counts[i])) for i in appeared[-k:]]
+
+    # 📄 由新到舊的原始資料列（期別, 日期, 星期, 號碼1~5）
+    @property
+    def rows(self):
+        if self._rows is None:
+            m = self.matrix
+            self._rows = [
+                (m.periods[i], str(m.dates[i]), WEEKDAY_NAMES[m.weekdays[i]], *(int(n) for n in m.numbers[i]))
+                for i in range(len(m) - 1, -1, -1)
+            ]
+        return self._rows
+
+    # 📄 最新 k 期
+    def latest_rows(self, k=10):
+        return self.rows[:k]
+
+
+# 🚀 建立資料模型（指紋與開獎矩陣同時取得，呼叫端可用指紋判斷是否需重建）
+def load_data_model(db_path=DB_PATH):
+    return LottoDataModel(load_draw_matrix(db_path), db_fingerprint(db_path))
+
+
+# 🧪 測試執行
+if __name__ == "__main__":
+    model = load_data_model()
+    print(f"🗃️ 資料模型：{model.total_draws} 期（{model.start_date} ～ {model.end_date}），指紋 {model.fingerprint}")
+    print(f"🔥 熱門號碼（前5）：{model.top_numbers(5)}")
+    print(f"📅 星期 × 號碼矩陣：{model.weekday_number_counts.shape}，合計 {model.weekday_number_counts.sum()}")
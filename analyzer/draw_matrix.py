@@ -0,0 +1,124 @@
+# 📦 匯入模組
+import sqlite3
+from pathlib import Path
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+DB_PATH = BASE_DIR / "lotto539.db"
+
+MAX_NUMBER = 39
+NUMBERS_PER_DRAW = 5
+WEEKDAY_NAMES = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
+WEEKDAY_INDEX = {name: i for i, name in enumerate(WEEKDAY_NAMES)}
+
+DRAW_COLUMNS_SQL = "SELECT period, draw_date, weekday, no1, no2, no3, no4, no5 FROM lotto539"
+
+# 🗂️ 已載入的開獎矩陣：資料庫路徑 → (指紋, 矩陣)；指紋未變時同一行程只掃描一次
+_MATRIX_CACHE = {}
+
+
+# 🧮 開獎矩陣：依開獎日期由舊到新排列
+class DrawMatrix:
+    def __init__(self, periods, dates, weekdays, numbers):
+        self.periods = periods      # list[str]，期別
+        self.dates = dates          # (N,) datetime64[D]，開獎日期
+        self.weekdays = weekdays    # (N,) uint8，0=星期一 … 6=星期日
+        self.numbers = numbers      # (N, 5) uint8，開出號碼（原始順序）
+        self._sorted_numbers = None
+        self._incidence = None
+        self._number_prefix = None
+        self._masks = None
+        self.derived = {}           # 由此矩陣衍生的分析結果（依名稱快取）
+
+    def __len__(self):
+        return len(self.numbers)
+
+    # 🔢 每期號碼由小到大排序
+    @property
+    def sorted_numbers(self):
+        if self._sorted_numbers is None:
+            self._sorted_numbers = np.sort(self.numbers, axis=1)
+        return self._sorted_numbers
+
+    # 🧱 (N, 39) 布林出現矩陣，第 j 欄代表號碼 j+1
+    @property
+    def incidence(self):
+        if self._incidence is None:
+            self._incidence = build_incidence(self.numbers)
+        return self._incidence
+
+    # 🎭 (N,) uint64 位元遮罩，第 n 位代表號碼 n
+    @property
+    def masks(self):
+        if self._masks is None:
+            from analyzer.bitmask import numbers_to_masks
+            self._masks = numbers_to_masks(self.numbers)
+        return self._masks
+
+    # ➕ (N+1, 39) 累計出現次數，第 i 列為前 i 期的合計；任意區間 [a, b) = prefix[b] - prefix[a]
+    @property
+    def number_prefix(self):
+        if self._number_prefix is None:
+            self._number_prefix = build_prefix(self.incidence)
+        return self._number_prefix
+
+
+# 🧱 由 (N, 5) 號碼陣列建立 (N, 39) 出現矩陣
+def build_incidence(numbers):
+    incidence = np.zeros((len(numbers), MAX_NUMBER), dtype=bool)
+    rows = np.arange(len(numbers))[:, None]
+    incidence[rows, numbers.astype(np.intp) - 1] = True
+    return incidence
+
+
+# ➕ 沿期數方向累加，前面補一列 0
+def build_prefix(values):
+    prefix = np.zeros((len(values) + 1,) + values.shape[1:], dtype=np.int32)
+    np.cumsum(values, axis=0, out=prefix[1:])
+    return prefix
+
+
+# 🔄 將資料庫查詢結果轉為開獎矩陣
+def build_draw_matrix(rows):
+    periods = [row[0] for row in rows]
+    dates = np.array([row[1] for row in rows], dtype="datetime64[D]")
+    weekdays = np.array([WEEKDAY_INDEX[row[2]] for row in rows], dtype=np.uint8)
+    numbers = np.array([row[3:8] for row in rows], dtype=np.uint8).reshape(-1, NUMBERS_PER_DRAW)
+    return DrawMatrix(periods, dates, weekdays, numbers)
+
+
+# 🔖 資料庫指紋（筆數 + 最新期別 + 最大 rowid），資料有異動時才會改變
+def db_fingerprint(db_path=DB_PATH):
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*), MAX(period), MAX(rowid) FROM lotto539")
+        count, last_period, last_rowid = cursor.fetchone()
+    return f"{count}:{last_period}:{last_rowid}"
+
+
+# 🚀 讀取整張 lotto539 資料表（資料未異動前每個行程只做一次全表掃描）
+def load_draw_matrix(db_path=DB_PATH, refresh=False):
+    key = str(db_path)
+    fingerprint = db_fingerprint(db_path)
+    cached = _MATRIX_CACHE.get(key)
+    if not refresh and cached and cached[0] == fingerprint:
+        return cached[1]
+
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(DRAW_COLUMNS_SQL + " ORDER BY draw_date")
+        rows = cursor.fetchall()
+
+    matrix = build_draw_matrix(rows)
+    _MATRIX_CACHE[key] = (fingerprint, matrix)
+    return matrix
+
+
+# 🧪 測試執行
+if __name__ == "__main__":
+    matrix = load_draw_matrix()
+    print(f"📦 已載入 {len(matrix)} 期開獎資料")
+    if len(matrix):
+        print(f"📆 資料期間：{matrix.dates[0]} ～ {matrix.dates[-1]}")
+        print(f"🧱 出現矩陣大小：{matrix.incidence.shape}")
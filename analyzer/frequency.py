@@ -1,21 +1,23 @@
 # 📦 匯入模組
-import sqlite3
-from collections import Counter
+import sys
 from pathlib import Path
+import numpy as np
 
 # 📁 路徑設定
-BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "lotto539.db"
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix
 
 # 📊 號碼出現頻率統計
-def get_number_frequency(limit=None, ascending=False):
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        numbers = [n for row in cursor.fetchall() for n in row]
-
-    counter = Counter(numbers)
-    sorted_freq = sorted(counter.items(), key=lambda x: x[1], reverse=not ascending)
+def get_number_frequency(limit=None, ascending=False, matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
+
+    counts = matrix.incidence.sum(axis=0)
+    appeared = np.flatnonzero(counts)
+    freq = [(int(i) + 1, int(counts[i])) for i in appeared]
+    sorted_freq = sorted(freq, key=lambda x: x[1], reverse=not ascending)
 
     if limit:
         return sorted_freq[:limit]
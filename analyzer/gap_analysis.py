@@ -1,164 +1,116 @@
 # 📦 匯入模組
-import sqlite3
+import sys
 from pathlib import Path
-from collections import defaultdict
-import statistics
-import matplotlib.pyplot as plt
+import numpy as np
 
 # 📁 路徑設定
 BASE_DIR = Path(__file__).resolve().parent.parent
-DB_PATH = BASE_DIR / "lotto539.db"
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix, MAX_NUMBER
+
+
+# 📏 39 個號碼的間隔總表（間隔以期數計，陣列依開獎日期由舊到新）
+class GapTable:
+    def __init__(self, total_draws, current_gap, gaps, offsets):
+        self.total_draws = total_draws
+        self.current_gap = current_gap      # (39,) 距最近一次開出的期數，從未開出為總期數
+        self.gaps = gaps                    # 所有號碼的間隔串接成一維陣列
+        self.offsets = offsets              # (40,) 號碼 n 的間隔位於 gaps[offsets[n-1]:offsets[n]]
+        self.counts = np.diff(offsets)
+
+        self.max = np.full(MAX_NUMBER, np.nan)
+        self.min = np.full(MAX_NUMBER, np.nan)
+        self.mean = np.full(MAX_NUMBER, np.nan)
+        self.median = np.full(MAX_NUMBER, np.nan)
+
+        has_gaps = self.counts > 0
+        if has_gaps.any():
+            starts = offsets[:-1][has_gaps]
+            counts = self.counts[has_gaps]
+            self.max[has_gaps] = np.maximum.reduceat(gaps, starts)
+            self.min[has_gaps] = np.minimum.reduceat(gaps, starts)
+            self.mean[has_gaps] = np.add.reduceat(gaps, starts) / counts
+
+            # 各號碼區段內排序後取中位數
+            group_ids = np.repeat(np.arange(MAX_NUMBER), self.counts)
+            ordered = gaps[np.lexsort((gaps, group_ids))]
+            low = ordered[starts + (counts - 1) // 2]
+            high = ordered[starts + counts // 2]
+            self.median[has_gaps] = (low + high) / 2
+
+    # 📜 單一號碼的間隔序列（由近到遠，與歷史介面相同）
+    def history(self, number):
+        return self.gaps[self.offsets[number - 1]:self.offsets[number]][::-1]
+
+    # 🔍 單一號碼的分析結果字典
+    def summary(self, number):
+        index = number - 1
+        current_gap = int(self.current_gap[index])
+        if not self.counts[index]:
+            return {
+                "current_gap": current_gap,
+                "history": [],
+                "stats": None,
+                "state": "首度分析，無歷史資料",
+            }
+
+        avg_gap = round(float(self.mean[index]), 2)
+        median_gap = float(self.median[index])
+        if self.counts[index] % 2:
+            median_gap = int(median_gap)
 
-# 🔍 分析單一號碼的間隔資料
-def analyze_single_number(target_number):
-    target_number = int(target_number)
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT draw_date, no1, no2, no3, no4, no5 FROM lotto539 ORDER BY draw_date DESC")
-        rows = cursor.fetchall()
-
-    gap_list = []
-    last_seen_index = None
-
-    for index, row in enumerate(rows):
-        date, *numbers = row
-        if target_number in numbers:
-            if last_seen_index is not None:
-                gap_list.append(index - last_seen_index)  # ✅ 修正方向，間隔期數應為遞增距離
-            last_seen_index = index
-
-    current_gap = last_seen_index if last_seen_index is not None else len(rows)
-
-    if not gap_list:
         return {
             "current_gap": current_gap,
-            "history": [],
-            "stats": None,
-            "state": "首度分析，無歷史資料",
+            "history": self.history(number).tolist(),
+            "stats": {
+                "max": int(self.max[index]),
+                "min": int(self.min[index]),
+                "avg": avg_gap,
+                "median": median_gap
+            },
+            "state": "🔥 熱號" if current_gap <= avg_gap else "❄️ 冷號"
         }
 
-    # 統計分析
-    max_gap = max(gap_list)
-    min_gap = min(gap_list)
-    avg_gap = round(sum(gap_list) / len(gap_list), 2)
-    median_gap = statistics.median(gap_list)
-    state = "🔥 熱號" if current_gap <= avg_gap else "❄️ 冷號"
-
-    return {
-        "current_gap": current_gap,
-        "history": gap_list,
-        "stats": {
-            "max": max_gap,
-            "min": min_gap,
-            "avg": avg_gap,
-            "median": median_gap
-        },
-        "state": state
-    }
 
-# 📊 繪製號碼間隔趨勢圖
-def plot_gap_trend(gap_list, target_number):
-    plt.figure(figsize=(10, 4))
-    plt.plot(range(1, len(gap_list) + 1), gap_list, marker='o', linestyle='-')
-    plt.title(f"號碼 {target_number:02d} 的歷史間隔趨勢")
-    plt.xlabel("出現次數（由近到遠）")
-    plt.ylabel("間隔期數")
-    plt.grid(True)
-    plt.tight_layout()
-    chart_path = BASE_DIR / f"charts/gap_{target_number:02d}.png"
-    chart_path.parent.mkdir(exist_ok=True)
-    plt.savefig(chart_path)
-    plt.close()
-    return chart_path
+# 📏 一次計算全部號碼的間隔（對出現位置做 np.diff）
+def analyze_all_gaps(matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
+    if "gap_table" in matrix.derived:
+        return matrix.derived["gap_table"]
 
-# 🧪 測試執行
-if __name__ == "__main__":
-    number = input("輸入要分析的號碼（01~39）：").zfill(2)
-    result = analyze_single_number(number)
-    print(f"\n🎯 號碼 {number} 分析結果")
-    print(f"➡️ 當前間隔期數：{result['current_gap']} 期")
+    total = len(matrix)
+    # 依號碼分組、組內依期數排序的出現位置
+    hit_numbers, hit_draws = np.nonzero(matrix.incidence.T)
+    boundaries = np.searchsorted(hit_numbers, np.arange(MAX_NUMBER + 1))
 
-    if result['stats']:
-        print("📊 歷史間隔統計：")
-        for k, v in result['stats'].items():
-            print(f"   {k}：{v}")
-        print(f"📌 狀態評估：{result['state']}")
+    # 同一號碼相鄰兩次出現的期數差即為間隔
+    same_number = hit_numbers[1:] == hit_numbers[:-1]
+    gaps = np.diff(hit_draws)[same_number]
+    offsets = np.searchsorted(hit_numbers[1:][same_number], np.arange(MAX_NUMBER + 1))
 
-        path = plot_gap_trend(result['history'], int(number))
-        print(f"📈 圖表已儲存：{path}")
-    else:
-        print("⚠️ 無足夠歷史資料可分析")
-# 📦 匯入模組
-import sqlite3
-from pathlib import Path
-from collections import defaultdict
-import statistics
-import matplotlib.pyplot as plt
+    current_gap = np.full(MAX_NUMBER, total)
+    appeared = boundaries[1:] > boundaries[:-1]
+    current_gap[appeared] = total - 1 - hit_draws[boundaries[1:][appeared] - 1]
+
+    table = GapTable(total, current_gap, gaps, offsets)
+    matrix.derived["gap_table"] = table
+    return table
 
-# 📁 路徑設定
-BASE_DIR = Path(__file__).resolve().parent.parent
-DB_PATH = BASE_DIR / "lotto539.db"
 
 # 🔍 分析單一號碼的間隔資料
 def analyze_single_number(target_number):
-    target_number = int(target_number)
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT draw_date, no1, no2, no3, no4, no5 FROM lotto539 ORDER BY draw_date DESC")
-        rows = cursor.fetchall()
-
-    gap_list = []
-    last_seen_index = None
-
-    for index, row in enumerate(rows):
-        date, *numbers = row
-        if target_number in numbers:
-            if last_seen_index is not None:
-                gap_list.append(index - last_seen_index)  # ✅ 修正方向，間隔期數應為遞增距離
-            last_seen_index = index
-
-    current_gap = last_seen_index if last_seen_index is not None else len(rows)
-
-    if not gap_list:
-        return {
-            "current_gap": current_gap,
-            "history": [],
-            "stats": None,
-            "state": "首度分析，無歷史資料",
-        }
-
-    # 統計分析
-    max_gap = max(gap_list)
-    min_gap = min(gap_list)
-    avg_gap = round(sum(gap_list) / len(gap_list), 2)
-    median_gap = statistics.median(gap_list)
-    state = "🔥 熱號" if current_gap <= avg_gap else "❄️ 冷號"
-
-    return {
-        "current_gap": current_gap,
-        "history": gap_list,
-        "stats": {
-            "max": max_gap,
-            "min": min_gap,
-            "avg": avg_gap,
-            "median": median_gap
-        },
-        "state": state
-    }
+    return analyze_all_gaps().summary(int(target_number))
 
 # 📊 繪製號碼間隔趨勢圖
 def plot_gap_trend(gap_list, target_number):
-    plt.figure(figsize=(10, 4))
-    plt.plot(range(1, len(gap_list) + 1), gap_list, marker='o', linestyle='-')
-    plt.title(f"號碼 {target_number:02d} 的歷史間隔趨勢")
-    plt.xlabel("出現次數（由近到遠）")
-    plt.ylabel("間隔期數")
-    plt.grid(True)
-    plt.tight_layout()
+    # matplotlib 匯入很重，只有真的要畫圖時才載入；與網頁版共用同一個 Figure 建構函式
+    from report.figures import gap_trend_figure
+
     chart_path = BASE_DIR / f"charts/gap_{target_number:02d}.png"
     chart_path.parent.mkdir(exist_ok=True)
-    plt.savefig(chart_path)
-    plt.close()
+    gap_trend_figure(gap_list, target_number).savefig(chart_path)
     return chart_path
 
 # 🧪 測試執行
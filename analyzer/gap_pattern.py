@@ -1,28 +1,22 @@
 # 📦 匯入模組
-import sqlite3
+import sys
 from pathlib import Path
-from collections import Counter
+import numpy as np
 
 # 📁 全域變數
-BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "lotto539.db"
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix
 
 # 📐 分析間距模式
-def analyze_gap_patterns():
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        rows = cursor.fetchall()
+def analyze_gap_patterns(matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
 
-    all_gaps = []
-
-    for row in rows:
-        sorted_nums = sorted(row)
-        gaps = [sorted_nums[i + 1] - sorted_nums[i] for i in range(len(sorted_nums) - 1)]
-        all_gaps.extend(gaps)
-
-    gap_counter = Counter(all_gaps)
-    return dict(sorted(gap_counter.items()))
+    gaps = np.diff(matrix.sorted_numbers.astype(np.int16), axis=1)
+    gap_counts = np.bincount(gaps.ravel())
+    return {gap: int(count) for gap, count in enumerate(gap_counts) if count > 0}
 
 # 🚀 主程式
 if __name__ == "__main__":
@@ -1,26 +1,56 @@
 # 📦 匯入模組
-import sqlite3
-from collections import Counter
+import sys
 from pathlib import Path
+import numpy as np
 
 # 📁 全域變數
-BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "lotto539.db"
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix
+from analyzer.rolling_window import rolling_counts, window_counts_at, draw_index_on_or_before, rank_hot_and_cold
 
 # 🔥 取得熱號與冷號
-def get_hot_and_cold_numbers(top_n=5):
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        all_numbers = [n for row in cursor.fetchall() for n in row]
+def get_hot_and_cold_numbers(top_n=5, matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
 
-    counter = Counter(all_numbers)
-    most_common = counter.most_common()
+    counts = matrix.incidence.sum(axis=0)
+    order = np.argsort(-counts, kind="stable")
+    most_common = [(int(i) + 1, int(counts[i])) for i in order if counts[i] > 0]
 
     hot = most_common[:top_n]
     cold = most_common[-top_n:]
     return hot, cold
 
+# 🪟 指定日期的視窗熱號與冷號（只看該日以前最近 window 期）
+def get_windowed_hot_and_cold(window=100, top_n=5, at_date=None, matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
+
+    index = len(matrix) - 1 if at_date is None else draw_index_on_or_before(matrix, at_date)
+    if index < 0:
+        return [], []
+
+    counts = window_counts_at(index, window, matrix)
+    hot_order = np.argsort(-counts, kind="stable")[:top_n]
+    cold_order = np.argsort(counts, kind="stable")[:top_n]  # 由最冷排起，同次數時小號碼在前
+    return [(int(i) + 1, int(counts[i])) for i in hot_order], [(int(i) + 1, int(counts[i])) for i in cold_order]
+
+# 📈 每一期的視窗熱號 / 冷號時間序列
+def get_hot_and_cold_timeline(window=100, top_n=5, matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
+
+    counts = rolling_counts(window, matrix)
+    hot, cold = rank_hot_and_cold(counts, top_n)
+    return {
+        "dates": matrix.dates,
+        "counts": counts,   # (N, 39) 每期往前 window 期的出現次數
+        "hot": hot,         # (N, top_n) 熱號
+        "cold": cold,       # (N, top_n) 冷號
+    }
+
 # 🚀 主程式
 if __name__ == "__main__":
     try:
@@ -1,21 +1,22 @@
 # 📦 匯入模組
-import sqlite3
+import sys
 from pathlib import Path
+import numpy as np
 
 # 📁 全域設定
-BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "lotto539.db"
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix
 
 # ⚖️ 奇偶統計分析
-def analyze_odd_even():
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        numbers = [n for row in cursor.fetchall() for n in row]
+def analyze_odd_even(matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
 
-    odd_count = sum(1 for n in numbers if n % 2 == 1)
-    even_count = sum(1 for n in numbers if n % 2 == 0)
-    total = len(numbers)
+    total = matrix.numbers.size
+    odd_count = int(np.count_nonzero(matrix.numbers & 1))
+    even_count = total - odd_count
 
     odd_ratio = round((odd_count / total) * 100, 2)
     even_ratio = round((even_count / total) * 100, 2)
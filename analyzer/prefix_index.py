@@ -0,0 +1,77 @@
+# 📦 匯入模組
+import sys
+from pathlib import Path
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix, build_prefix, MAX_NUMBER, WEEKDAY_NAMES
+from analyzer.range_segment import SEGMENT_LABELS, get_segments
+
+# 🔢 號碼 → 尾數 / 區段 / 奇數 的對應矩陣（出現矩陣乘上即得每期計數）
+NUMBER_VALUES = np.arange(1, MAX_NUMBER + 1)
+TAIL_MATRIX = (NUMBER_VALUES[:, None] % 10 == np.arange(10)).astype(np.int32)
+SEGMENT_MATRIX = (get_segments(NUMBER_VALUES)[:, None] == np.arange(1, 5)).astype(np.int32)
+ODD_VECTOR = (NUMBER_VALUES % 2).astype(np.int32)
+
+
+# 📚 依開獎順序累加的各項計數；任意區間 = 兩次二分搜尋 + 一次相減
+class PrefixIndex:
+    def __init__(self, matrix):
+        self.dates = matrix.dates
+        hits = matrix.incidence.astype(np.int32)
+        self.numbers = matrix.number_prefix                                     # (N+1, 39)
+        self.tails = build_prefix(hits @ TAIL_MATRIX)                           # (N+1, 10)
+        self.segments = build_prefix(hits @ SEGMENT_MATRIX)                     # (N+1, 4)
+        self.odd = build_prefix(hits @ ODD_VECTOR)                              # (N+1,)
+        self.weekdays = build_prefix(matrix.weekdays[:, None] == np.arange(7))  # (N+1, 7)
+
+    # 🔍 日期區間 → 開獎索引區間 [start, end)
+    def locate(self, start_date=None, end_date=None):
+        start = 0 if start_date is None else int(np.searchsorted(self.dates, np.datetime64(start_date, "D"), side="left"))
+        end = len(self.dates) if end_date is None else int(np.searchsorted(self.dates, np.datetime64(end_date, "D"), side="right"))
+        return start, max(start, end)
+
+    # 🔍 日期區間內最近 count 期的索引區間 [start, end)
+    def last_draws(self, start_date=None, end_date=None, count=144):
+        start, end = self.locate(start_date, end_date)
+        return max(start, end - count), end
+
+    # 📊 任意索引區間的統計
+    def slice_stats(self, start, end):
+        total_draws = end - start
+        odd = int(self.odd[end] - self.odd[start])
+        return {
+            "total_draws": total_draws,
+            "start_date": str(self.dates[start]) if total_draws else None,
+            "end_date": str(self.dates[end - 1]) if total_draws else None,
+            "number_counts": (self.numbers[end] - self.numbers[start]).tolist(),
+            "odd": odd,
+            "even": total_draws * 5 - odd,
+            "tail_counts": (self.tails[end] - self.tails[start]).tolist(),
+            "segment_counts": dict(zip(SEGMENT_LABELS.values(), (self.segments[end] - self.segments[start]).tolist())),
+            "weekday_counts": dict(zip(WEEKDAY_NAMES, (self.weekdays[end] - self.weekdays[start]).tolist())),
+        }
+
+    # 📊 日期區間統計（日期可為 None 表示不設限）
+    def range_stats(self, start_date=None, end_date=None):
+        return self.slice_stats(*self.locate(start_date, end_date))
+
+
+# 🚀 取得（並快取於開獎矩陣上的）前綴索引
+def get_prefix_index(matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
+    if "prefix_index" not in matrix.derived:
+        matrix.derived["prefix_index"] = PrefixIndex(matrix)
+    return matrix.derived["prefix_index"]
+
+
+# 🧪 測試執行
+if __name__ == "__main__":
+    stats = get_prefix_index().range_stats("2024-01-01", "2024-12-31")
+    print(f"📅 2024 年共 {stats['total_draws']} 期（{stats['start_date']} ～ {stats['end_date']}）")
+    print(f"⚖️ 奇數：{stats['odd']}，偶數：{stats['even']}")
+    print(f"📊 區間分布：{stats['segment_counts']}")
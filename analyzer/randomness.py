@@ -0,0 +1,227 @@
+# 📦 匯入模組
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix, MAX_NUMBER, NUMBERS_PER_DRAW
+from analyzer.prefix_index import TAIL_MATRIX, ODD_VECTOR
+
+DEFAULT_SIMULATIONS = 1000   # 模擬幾份「與實際同樣期數」的隨機歷史
+BATCH_REPLICATES = 8         # 每個工作單位同時模擬的歷史份數
+CHUNK_DRAWS = 2048           # 每次產生的期數；記憶體用量約 批次 × 區塊 × 39 × 8 bytes，與總期數無關
+SIGNIFICANCE = 0.05          # 顯著水準（各號碼的 p 值先經 Holm 多重比較校正）
+
+# 📋 整體統計量：名稱 → (說明, 檢定方向)
+STATISTICS = {
+    "frequency_chi2": ("號碼次數卡方值", "upper"),
+    "tail_chi2": ("尾數次數卡方值", "upper"),
+    "odd_ratio": ("奇數比例", "two-sided"),
+    "consecutive": ("連號組數", "two-sided"),
+    "max_gap": ("最長間隔期數", "upper"),
+}
+
+NUMBER_PROBABILITY = NUMBERS_PER_DRAW / MAX_NUMBER
+TAIL_WEIGHTS = TAIL_MATRIX.sum(axis=0) / MAX_NUMBER   # 尾數 0 只有 3 個號碼，其餘 4 個
+
+
+# 🎲 隨機開獎：每期 39 個亂數中最小的 5 個即為開出號碼，回傳 (批次, 期數, 39) 出現矩陣
+def sample_incidence(rng, replicates, draws):
+    keys = rng.random((replicates, draws, MAX_NUMBER))
+    threshold = np.partition(keys, NUMBERS_PER_DRAW - 1, axis=-1)[..., NUMBERS_PER_DRAW - 1:NUMBERS_PER_DRAW]
+    return keys <= threshold
+
+
+# 🧮 逐區塊累計的統計狀態（每份歷史各自一份，跨區塊只保留常數大小的累計值）
+class StreamingStats:
+    def __init__(self, replicates):
+        self.total_draws = 0
+        self.counts = np.zeros((replicates, MAX_NUMBER), dtype=np.int64)
+        self.consecutive = np.zeros(replicates, dtype=np.int64)
+        self.last_seen = np.full((replicates, MAX_NUMBER), -1, dtype=np.int64)
+        self.max_gap = np.zeros((replicates, MAX_NUMBER), dtype=np.int64)
+
+    # ➕ 納入一個區塊 (批次, 期數, 39)
+    def update(self, incidence):
+        draws = incidence.shape[1]
+        index = np.arange(self.total_draws, self.total_draws + draws)[None, :, None]
+
+        self.counts += incidence.sum(axis=1)
+        self.consecutive += (incidence[..., :-1] & incidence[..., 1:]).sum(axis=(1, 2))
+
+        # 🔁 每個位置往前最後一次出現的期數（接續上一區塊），出現時與前一次相減即為間隔
+        seen = np.where(incidence, index, -1)
+        last = np.maximum(np.maximum.accumulate(seen, axis=1), self.last_seen[:, None, :])
+        previous = np.concatenate([self.last_seen[:, None, :], last[:, :-1]], axis=1)
+        gaps = np.where(incidence & (previous >= 0), index - previous, 0)
+        self.max_gap = np.maximum(self.max_gap, gaps.max(axis=1))
+
+        self.last_seen = last[:, -1]
+        self.total_draws += draws
+
+    # 📊 每份歷史的整體統計量與各號碼數值
+    def results(self):
+        total = self.total_draws
+        expected = total * NUMBER_PROBABILITY
+        tails = self.counts @ TAIL_MATRIX
+        tail_expected = total * NUMBERS_PER_DRAW * TAIL_WEIGHTS
+        current_gap = np.where(self.last_seen >= 0, total - 1 - self.last_seen, total)
+        return {
+            "frequency_chi2": ((self.counts - expected) ** 2 / expected).sum(axis=1),
+            "tail_chi2": ((tails - tail_expected) ** 2 / tail_expected).sum(axis=1),
+            "odd_ratio": (self.counts @ ODD_VECTOR) / (total * NUMBERS_PER_DRAW),
+            "consecutive": self.consecutive.astype(float),
+            "max_gap": self.max_gap.max(axis=1).astype(float),
+            "counts": self.counts,
+            "current_gap": current_gap,
+        }
+
+
+# 🎲 單一工作單位：以獨立亂數流模擬 replicates 份歷史
+def _simulate_batch(task):
+    seed, replicates, total_draws, chunk_draws = task
+    rng = np.random.default_rng(seed)
+    stats = StreamingStats(replicates)
+    for start in range(0, total_draws, chunk_draws):
+        stats.update(sample_incidence(rng, replicates, min(chunk_draws, total_draws - start)))
+
+    results = stats.results()
+    return {
+        **{name: results[name] for name in STATISTICS},
+        # 39 個號碼在虛無假設下可交換，合併成單一號碼的次數 / 遺漏期數分布
+        "count_hist": np.bincount(results["counts"].ravel(), minlength=total_draws + 1),
+        "gap_hist": np.bincount(results["current_gap"].ravel(), minlength=total_draws + 1),
+    }
+
+
+# 🚀 建立虛無分布（分批平行；相同 seed 不論行程數結果一致）
+def simulate_null(total_draws, simulations=DEFAULT_SIMULATIONS, seed=539, workers=None,
+                  batch_replicates=BATCH_REPLICATES, chunk_draws=CHUNK_DRAWS):
+    sizes = [min(batch_replicates, simulations - start) for start in range(0, simulations, batch_replicates)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(child, size, total_draws, chunk_draws) for child, size in zip(seeds, sizes)]
+
+    if workers == 1:
+        batches = [_simulate_batch(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            batches = list(executor.map(_simulate_batch, tasks))
+
+    null = {name: np.concatenate([batch[name] for batch in batches]) for name in STATISTICS}
+    null["count_hist"] = sum(batch["count_hist"] for batch in batches)
+    null["gap_hist"] = sum(batch["gap_hist"] for batch in batches)
+    return null
+
+
+# 📐 蒙地卡羅 p 值（含觀測值本身，避免出現 0）
+def empirical_p_value(null_values, observed, tail="upper"):
+    total = len(null_values) + 1
+    upper = (np.count_nonzero(null_values >= observed) + 1) / total
+    if tail == "upper":
+        return upper
+    lower = (np.count_nonzero(null_values <= observed) + 1) / total
+    return min(1.0, 2 * min(upper, lower))
+
+
+# 📐 Holm 多重比較校正：同一檢定同時看 39 個號碼時，控制「至少誤判一個」的機率
+def holm_adjust(p_values):
+    p_values = np.asarray(p_values, dtype=np.float64)
+    order = np.argsort(p_values, kind="stable")
+    scaled = (len(p_values) - np.arange(len(p_values))) * p_values[order]
+    adjusted = np.empty_like(p_values)
+    adjusted[order] = np.minimum(1.0, np.maximum.accumulate(scaled))
+    return adjusted
+
+
+# 📐 由直方圖計算尾端機率：P(X >= x) 與 P(X <= x)
+def histogram_tails(histogram):
+    probability = histogram / histogram.sum()
+    at_least = np.cumsum(probability[::-1])[::-1]
+    at_most = np.cumsum(probability)
+    return at_least, at_most
+
+
+# 🚀 實際開獎 vs 隨機虛無分布
+def run_randomness_tests(matrix=None, simulations=DEFAULT_SIMULATIONS, seed=539, workers=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
+
+    observed_stats = StreamingStats(1)
+    observed_stats.update(matrix.incidence[None])
+    observed = observed_stats.results()
+    null = simulate_null(len(matrix), simulations, seed, workers)
+
+    statistics = {}
+    for name, (label, tail) in STATISTICS.items():
+        value = float(observed[name][0])
+        statistics[name] = {
+            "label": label,
+            "observed": value,
+            "null_mean": float(null[name].mean()),
+            "null_std": float(null[name].std()),
+            "p_value": empirical_p_value(null[name], value, tail),
+        }
+
+    # 🔥 各號碼：次數偏多 / 偏少、遺漏期數偏長的機率（*_p 為單一號碼的 p 值，*_p_adj 為 39 個號碼 Holm 校正後）
+    count_at_least, count_at_most = histogram_tails(null["count_hist"])
+    gap_at_least, _ = histogram_tails(null["gap_hist"])
+    counts = observed["counts"][0]
+    gaps = observed["current_gap"][0]
+    p_values = {
+        "hot_p": count_at_least[counts],
+        "cold_p": count_at_most[counts],
+        "gap_p": gap_at_least[gaps],
+    }
+    adjusted = {f"{name}_adj": holm_adjust(values) for name, values in p_values.items()}
+    numbers = [{
+        "number": n + 1,
+        "count": int(counts[n]),
+        "current_gap": int(gaps[n]),
+        **{name: float(values[n]) for name, values in {**p_values, **adjusted}.items()},
+    } for n in range(MAX_NUMBER)]
+
+    return {"total_draws": len(matrix), "simulations": simulations, "statistics": statistics, "numbers": numbers}
+
+
+# 🚀 主程式
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="今彩539 隨機性檢定（蒙地卡羅）")
+    parser.add_argument("--simulations", type=int, default=DEFAULT_SIMULATIONS, help="模擬歷史份數")
+    parser.add_argument("--seed", type=int, default=539, help="亂數種子")
+    parser.add_argument("--workers", type=int, default=None, help="工作行程數（1 表示不開行程）")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    report = run_randomness_tests(simulations=args.simulations, seed=args.seed, workers=args.workers)
+    simulated = report["simulations"] * report["total_draws"]
+    print(f"🎲 今彩539 隨機性檢定（{report['total_draws']} 期 × {report['simulations']} 份模擬，共 {simulated:,} 期）")
+    print(f"⏱️ 耗時：{time.perf_counter() - started:.2f} 秒")
+    print("=" * 40)
+    for stat in report["statistics"].values():
+        print(f"{stat['label']}：{stat['observed']:.4f}（隨機平均 {stat['null_mean']:.4f} ± {stat['null_std']:.4f}）p = {stat['p_value']:.4f}")
+
+    print(f"\n📌 顯著偏離隨機的號碼（39 個號碼經 Holm 校正後 p < {SIGNIFICANCE}）：")
+    flagged = False
+    for item in report["numbers"]:
+        labels = []
+        if item["hot_p_adj"] < SIGNIFICANCE:
+            labels.append(f"🔥 次數偏多 {item['count']} 次（校正後 p = {item['hot_p_adj']:.4f}）")
+        if item["cold_p_adj"] < SIGNIFICANCE:
+            labels.append(f"❄️ 次數偏少 {item['count']} 次（校正後 p = {item['cold_p_adj']:.4f}）")
+        if item["gap_p_adj"] < SIGNIFICANCE:
+            labels.append(f"⏳ 遺漏 {item['current_gap']} 期（校正後 p = {item['gap_p_adj']:.4f}）")
+        if labels:
+            flagged = True
+            print(f"  號碼 {item['number']:02d}：" + "；".join(labels))
+    if not flagged:
+        print("  （無）")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
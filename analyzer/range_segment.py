@@ -1,11 +1,13 @@
 # 📦 匯入模組
-import sqlite3
+import sys
 from pathlib import Path
-from collections import Counter
+import numpy as np
 
 # 📁 全域變數
-BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "lotto539.db"
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix
 
 # 🔢 區間標籤
 SEGMENT_LABELS = {
@@ -28,23 +30,21 @@ def get_segment(num):
     else:
         return 0  # 非法號碼
 
-# 📊 區間分析主函式
-def analyze_range_segments():
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        rows = cursor.fetchall()
+# 🧠 向量化計算區段（1~4，非法號碼為 0）
+def get_segments(numbers):
+    numbers = np.asarray(numbers, dtype=np.int16)
+    segments = (numbers - 1) // 10 + 1
+    return np.where((numbers >= 1) & (numbers <= 39), segments, 0)
 
-    segment_counter = Counter()
+# 📊 區間分析主函式
+def analyze_range_segments(matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
 
-    for row in rows:
-        for num in row:
-            segment = get_segment(num)
-            if segment:
-                segment_counter[segment] += 1
+    segment_counts = np.bincount(get_segments(matrix.numbers).ravel(), minlength=5)
 
     # 依照 1~4 區段排序並轉成標籤輸出
-    return {SEGMENT_LABELS[k]: segment_counter[k] for k in sorted(SEGMENT_LABELS)}
+    return {SEGMENT_LABELS[k]: int(segment_counts[k]) for k in sorted(SEGMENT_LABELS)}
 
 # 🚀 主程式
 if __name__ == "__main__":
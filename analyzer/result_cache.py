@@ -0,0 +1,174 @@
+# 📦 匯入模組
+import os
+import sys
+import time
+import argparse
+import pickle
+import hashlib
+import sqlite3
+import functools
+import importlib
+from pathlib import Path
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import DB_PATH, DrawMatrix, db_fingerprint
+
+CACHE_PATH = BASE_DIR / "data" / "result_cache.db"
+MAX_ENTRIES = 256                  # 最多保留幾筆結果
+MAX_BYTES = 64 * 1024 * 1024       # 所有結果合計上限（pickle 後大小）
+DISABLE_ENV = "LOTTO539_NO_CACHE"  # 設為 1 時停用快取（除錯用）
+CACHE_VERSION = 2                  # 快取內容格式不相容時遞增，舊結果全部失效
+
+# 🧱 結果快取資料表（獨立檔案，不動到 lotto539.db）
+CREATE_RESULT_CACHE_SQL = """
+CREATE TABLE IF NOT EXISTS result_cache (
+    key TEXT PRIMARY KEY,
+    func TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed_at REAL NOT NULL
+);
+"""
+
+# 🧹 依最近使用時間淘汰：超過筆數上限，或累計大小超過位元組上限者刪除
+EVICT_SQL = """
+DELETE FROM result_cache WHERE key IN (
+    SELECT key FROM (
+        SELECT key,
+               ROW_NUMBER() OVER (ORDER BY accessed_at DESC) AS position,
+               SUM(size) OVER (ORDER BY accessed_at DESC) AS total_size
+        FROM result_cache
+    )
+    WHERE position > ? OR total_size > ?
+)
+"""
+
+
+def _connect(cache_path):
+    Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(cache_path)
+    conn.execute(CREATE_RESULT_CACHE_SQL)
+    return conn
+
+
+# 🧬 程式碼指紋：位元碼 + 名稱 + 常數（函式內的 lambda / 巢狀函式遞迴計入）
+def code_digest(code, digest=None):
+    digest = digest or hashlib.sha256()
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            code_digest(const, digest)
+        elif isinstance(const, frozenset):
+            # 集合的 repr 順序會隨字串雜湊種子改變，排序後才跨行程穩定
+            digest.update(repr(sorted(map(repr, const))).encode("utf-8"))
+        else:
+            digest.update(repr(const).encode("utf-8"))
+    return digest
+
+
+# 🧬 函式版本：程式碼指紋 + 快取版本 + 所在模組與 depends 模組的原始碼
+#    （模組層級的彙總表、輔助函式改動時，結果也會重新計算）
+def function_version(func, depends=()):
+    digest = code_digest(func.__code__)
+    digest.update(str(CACHE_VERSION).encode("utf-8"))
+    paths = [func.__code__.co_filename] + [importlib.import_module(module).__file__ for module in depends]
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+# 🔑 快取鍵：函式名稱 + 函式版本 + 參數 + 資料庫指紋
+def make_cache_key(name, code, args, kwargs, fingerprint):
+    raw = repr((name, code, args, sorted(kwargs.items()), fingerprint)).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+# 🗃️ 裝飾器：結果只取決於 lotto539 資料表的函式，可跨行程重複使用
+#    傳入開獎矩陣（非預設資料來源）時直接計算、不經過快取
+#    depends：計算時另外呼叫到的模組名稱（如 "analyzer.bitmask"），其原始碼變動也會使快取失效
+def cached_result(db_path=DB_PATH, cache_path=CACHE_PATH, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, depends=()):
+    def decorator(func):
+        name = f"{Path(func.__code__.co_filename).stem}.{func.__qualname__}"
+        code = function_version(func, depends)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            values = list(args) + list(kwargs.values())
+            if os.environ.get(DISABLE_ENV) == "1" or any(isinstance(v, DrawMatrix) for v in values):
+                return func(*args, **kwargs)
+
+            try:
+                fingerprint = db_fingerprint(db_path)
+                key = make_cache_key(name, code, args, kwargs, fingerprint)
+                with _connect(cache_path) as conn:
+                    cursor = conn.cursor()
+                    cursor.execute("SELECT value FROM result_cache WHERE key = ?", (key,))
+                    row = cursor.fetchone()
+                    if row:
+                        cursor.execute("UPDATE result_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            except sqlite3.Error as e:
+                print(f"[WARN] 結果快取無法使用，改為直接計算：{e}")
+                return func(*args, **kwargs)
+
+            if row:
+                # 還原失敗（類別已改名、模組已移除、資料毀損…）時重新計算並覆寫這筆快取
+                try:
+                    return pickle.loads(row[0])
+                except Exception as e:
+                    print(f"[WARN] 快取結果無法還原，重新計算：{e}")
+
+            result = func(*args, **kwargs)
+            value = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            try:
+                with _connect(cache_path) as conn:
+                    cursor = conn.cursor()
+                    # 資料表已有新資料時，舊指紋的結果不會再被命中，一併清除
+                    cursor.execute("DELETE FROM result_cache WHERE fingerprint != ?", (fingerprint,))
+                    cursor.execute("""
+                        INSERT OR REPLACE INTO result_cache (key, func, fingerprint, value, size, accessed_at)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, (key, name, fingerprint, value, len(value), time.time()))
+                    cursor.execute(EVICT_SQL, (max_entries, max_bytes))
+            except sqlite3.Error as e:
+                print(f"[WARN] 結果快取寫入失敗：{e}")
+            return result
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+
+# 🧹 清除全部快取結果
+def clear_result_cache(cache_path=CACHE_PATH):
+    with _connect(cache_path) as conn:
+        conn.execute("DELETE FROM result_cache")
+
+
+# 🚀 主程式
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="查看 / 清除分析結果快取")
+    parser.add_argument("--clear", action="store_true", help="清除全部快取結果")
+    args = parser.parse_args(argv)
+
+    if args.clear:
+        clear_result_cache()
+        print("🧹 結果快取已清除")
+    else:
+        with _connect(CACHE_PATH) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT func, COUNT(*), SUM(size) FROM result_cache GROUP BY func ORDER BY func")
+            rows = cursor.fetchall()
+        print(f"🗃️ 結果快取：{CACHE_PATH}")
+        for func, count, size in rows:
+            print(f"  {func}：{count} 筆，{size / 1024:.1f} KB")
+        if not rows:
+            print("  （空）")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# 📦 匯入模組
+import sys
+from pathlib import Path
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix
+
+DEFAULT_WINDOWS = (30, 100, 300)
+
+
+# 🪟 每一期往前 window 期（含當期）的號碼出現次數，回傳 (N, 39)
+def rolling_counts(window, matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
+    key = f"rolling_counts_{window}"
+    if key in matrix.derived:
+        return matrix.derived[key]
+
+    prefix = matrix.number_prefix
+    end = np.arange(1, len(matrix) + 1)
+    start = np.maximum(end - window, 0)
+    counts = prefix[end] - prefix[start]
+    matrix.derived[key] = counts
+    return counts
+
+
+# 🪟 單一時間點的視窗次數：兩列累計值相減即可
+def window_counts_at(index, window, matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
+    prefix = matrix.number_prefix
+    end = index + 1
+    return prefix[end] - prefix[max(end - window, 0)]
+
+
+# 📅 找出指定日期（含）之前最後一期的索引
+def draw_index_on_or_before(matrix, draw_date):
+    return int(np.searchsorted(matrix.dates, np.datetime64(draw_date, "D"), side="right")) - 1
+
+
+# 🔥 每一期的視窗熱號 / 冷號排行（次數相同時號碼小者在前）
+def rank_hot_and_cold(counts, top_n=5):
+    # 冷號另做遞增穩定排序（反轉熱號順序會讓同次數的大號碼排在前面）
+    hot = np.argsort(-counts, axis=1, kind="stable")[:, :top_n] + 1
+    cold = np.argsort(counts, axis=1, kind="stable")[:, :top_n] + 1
+    return hot, cold
+
+
+# 🚀 主程式
+if __name__ == "__main__":
+    matrix = load_draw_matrix()
+    print(f"🪟 今彩539 視窗熱號（最新一期：{matrix.dates[-1]}）")
+    print("=" * 35)
+    for window in DEFAULT_WINDOWS:
+        hot, cold = rank_hot_and_cold(rolling_counts(window, matrix)[-1:])
+        print(f"近 {window} 期 🔥 {hot[0].tolist()}  ❄️ {cold[0].tolist()}")
@@ -0,0 +1,118 @@
+# 📦 匯入模組
+import sys
+import json
+import sqlite3
+from pathlib import Path
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import DB_PATH, DRAW_COLUMNS_SQL, build_draw_matrix
+from analyzer.bitmask import consecutive_pairs
+from analyzer.cooccurrence import count_pairs, count_triples
+
+# 🧱 累計統計資料表（單列：最後納入的期別 + 各項計數器）
+CREATE_STATS_CACHE_SQL = """
+CREATE TABLE IF NOT EXISTS stats_cache (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    last_period TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+
+COUNTER_KEYS = (
+    "number_counts", "tail_counts", "weekday_counts", "consecutive_distribution",
+    "pair_counts", "triple_counts",
+)
+
+
+# 🧮 由開獎矩陣計算各項計數器
+def compute_statistics(matrix):
+    total_rows = len(matrix)
+    odd = int(np.count_nonzero(matrix.numbers & 1))
+    consecutive = consecutive_pairs(matrix.masks).astype(np.intp)
+    return {
+        "total_rows": total_rows,
+        "start_date": str(matrix.dates.min()) if total_rows else None,
+        "end_date": str(matrix.dates.max()) if total_rows else None,
+        "number_counts": matrix.incidence.sum(axis=0).tolist(),
+        "tail_counts": np.bincount((matrix.numbers % 10).ravel(), minlength=10).tolist(),
+        "odd": odd,
+        "even": int(matrix.numbers.size - odd),
+        "consecutive_count": int(consecutive.sum()),
+        "consecutive_distribution": np.bincount(consecutive, minlength=5).tolist(),
+        "weekday_counts": np.bincount(matrix.weekdays, minlength=7).tolist(),
+        "pair_counts": count_pairs(matrix.incidence).ravel().tolist(),
+        "triple_counts": count_triples(matrix.sorted_numbers).tolist(),
+    }
+
+
+# ➕ 合併兩份計數器（舊統計 + 新增期數）
+def merge_statistics(base, delta):
+    if not base["total_rows"]:
+        return delta
+    if not delta["total_rows"]:
+        return base
+
+    merged = {
+        "total_rows": base["total_rows"] + delta["total_rows"],
+        "start_date": min(base["start_date"], delta["start_date"]),
+        "end_date": max(base["end_date"], delta["end_date"]),
+        "odd": base["odd"] + delta["odd"],
+        "even": base["even"] + delta["even"],
+        "consecutive_count": base["consecutive_count"] + delta["consecutive_count"],
+    }
+    for key in COUNTER_KEYS:
+        merged[key] = [a + b for a, b in zip(base[key], delta[key])]
+    return merged
+
+
+# 🔍 讀取期別大於 last_period 的開獎資料（走 period 唯一索引）
+def fetch_draws_after(cursor, last_period):
+    cursor.execute(DRAW_COLUMNS_SQL + " WHERE period > ? ORDER BY period", (last_period,))
+    return cursor.fetchall()
+
+
+# 🔄 將新匯入的期數納入累計統計，必要時整份重建
+def refresh_stats_cache(db_path=DB_PATH):
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        cursor.execute(CREATE_STATS_CACHE_SQL)
+        cursor.execute("SELECT last_period, row_count, payload FROM stats_cache WHERE id = 1")
+        cached = cursor.fetchone()
+        cursor.execute("SELECT COUNT(*) FROM lotto539")
+        total_rows = cursor.fetchone()[0]
+
+        stats, new_rows = None, []
+        if cached and cached[1] <= total_rows:
+            new_rows = fetch_draws_after(cursor, cached[0])
+            # 期數對不上代表有補登舊期別或刪除資料；缺少新版計數器時也整份重建
+            cached_stats = json.loads(cached[2])
+            if cached[1] + len(new_rows) == total_rows and all(key in cached_stats for key in COUNTER_KEYS):
+                stats = cached_stats
+                if not new_rows:
+                    return stats
+
+        if stats is None:
+            stats = compute_statistics(build_draw_matrix([]))
+            new_rows = fetch_draws_after(cursor, "")
+
+        stats = merge_statistics(stats, compute_statistics(build_draw_matrix(new_rows)))
+        last_period = new_rows[-1][0] if new_rows else (cached[0] if cached else "")
+
+        cursor.execute("""
+            INSERT OR REPLACE INTO stats_cache (id, last_period, row_count, payload)
+            VALUES (1, ?, ?, ?)
+        """, (last_period, stats["total_rows"], json.dumps(stats)))
+        conn.commit()
+
+    return stats
+
+
+# 🚀 主程式
+if __name__ == "__main__":
+    stats = refresh_stats_cache()
+    print(f"✅ 累計統計已更新：共 {stats['total_rows']} 期（{stats['start_date']} ～ {stats['end_date']}）")
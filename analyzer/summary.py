@@ -1,47 +1,38 @@
 # 📦 匯入模組
-import sqlite3
+import sys
+import argparse
 from collections import Counter
 from pathlib import Path
-from datetime import datetime
 
 # 📁 全域路徑
-BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "lotto539.db"
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import WEEKDAY_NAMES
+from analyzer.stats_cache import compute_statistics, refresh_stats_cache
+from analyzer.result_cache import cached_result
+
+# 📥 摘要所需統計（資料表沒有新期數時直接讀取結果快取）
+@cached_result()
+def load_summary_statistics(matrix=None):
+    # 預設讀取累計統計（只納入上次之後新增的期數），指定矩陣時直接計算
+    return refresh_stats_cache() if matrix is None else compute_statistics(matrix)
 
 # 🧠 分析資料摘要
-def summarize_statistics():
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-
-        # 總筆數與日期範圍
-        cursor.execute("SELECT COUNT(*), MIN(draw_date), MAX(draw_date) FROM lotto539")
-        total_rows, start_date, end_date = cursor.fetchone()
-
-        # 所有號碼平攤為一個 list
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        all_numbers = [num for row in cursor.fetchall() for num in row]
-        number_counter = Counter(all_numbers)
-
-        # 奇偶比例
-        odd = sum(1 for n in all_numbers if n % 2 == 1)
-        even = sum(1 for n in all_numbers if n % 2 == 0)
-
-        # 尾數分析
-        tail_counter = Counter(n % 10 for n in all_numbers)
-
-        # 連號次數
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        consecutive_count = 0
-        for row in cursor.fetchall():
-            sorted_row = sorted(row)
-            for i in range(4):
-                if sorted_row[i] + 1 == sorted_row[i + 1]:
-                    consecutive_count += 1
-
-        # 星期統計
-        cursor.execute("SELECT weekday FROM lotto539")
-        weekdays = [row[0] for row in cursor.fetchall()]
-        weekday_counter = Counter(weekdays)
+def summarize_statistics(matrix=None):
+    stats = load_summary_statistics(matrix)
+
+    # 總筆數與日期範圍
+    total_rows, start_date, end_date = stats["total_rows"], stats["start_date"], stats["end_date"]
+
+    # 號碼、尾數、星期計數
+    number_counter = Counter({n + 1: c for n, c in enumerate(stats["number_counts"]) if c > 0})
+    tail_counter = Counter({t: c for t, c in enumerate(stats["tail_counts"]) if c > 0})
+    weekday_counter = Counter({WEEKDAY_NAMES[i]: c for i, c in enumerate(stats["weekday_counts"]) if c > 0})
+
+    # 奇偶比例與連號次數
+    odd, even = stats["odd"], stats["even"]
+    consecutive_count = stats["consecutive_count"]
 
     # 🧾 顯示結果
     print("📊 今彩539 數據摘要分析")
@@ -59,5 +50,10 @@ def summarize_statistics():
     print("=" * 40)
 
 # 🚀 主程式
-if __name__ == "__main__":
+def main(argv=None):
+    argparse.ArgumentParser(description="今彩539 統計摘要分析").parse_args(argv)
     summarize_statistics()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,23 @@
 # 📦 匯入模組
-import sqlite3
-from collections import Counter
+import sys
 from pathlib import Path
+import numpy as np
 
 # 📁 全域設定
-BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "lotto539.db"
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix
 
 # 🔢 尾數分析
-def analyze_tail_digits():
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        all_numbers = [n for row in cursor.fetchall() for n in row]
+def analyze_tail_digits(matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
 
-    tail_digits = [n % 10 for n in all_numbers]
-    tail_counter = Counter(tail_digits)
+    tail_counts = np.bincount((matrix.numbers % 10).ravel(), minlength=10)
 
-    return sorted(tail_counter.items())  # 依照尾數 0~9 排序輸出
+    # 依照尾數 0~9 排序輸出
+    return [(tail, int(count)) for tail, count in enumerate(tail_counts) if count > 0]
 
 # 🚀 主程式
 if __name__ == "__main__":
@@ -1,12 +1,13 @@
 # 📦 匯入模組
-import sqlite3
-from collections import Counter
+import sys
 from pathlib import Path
 from datetime import datetime
 
 # 📁 全域變數
-BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "lotto539.db"
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.prefix_index import get_prefix_index
 
 # ⏱️ 日期格式轉換（共用）
 def normalize_date(input_str):
@@ -19,23 +20,14 @@ def normalize_date(input_str):
 
 # 📊 查詢各星期的開獎次數
 def get_weekday_statistics(start_date=None, end_date=None):
-    query = "SELECT weekday FROM lotto539"
-    params = ()
-
+    start_fmt = end_fmt = None
     if start_date and end_date:
         start_fmt = normalize_date(start_date)
         end_fmt = normalize_date(end_date)
-        query += " WHERE draw_date BETWEEN ? AND ?"
-        params = (start_fmt, end_fmt)
-
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
 
-    weekdays = [row[0] for row in rows]
-    counter = Counter(weekdays)
-    return dict(sorted(counter.items(), key=lambda x: ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"].index(x[0])))
+    # 由前綴索引取區間內各星期期數（依星期一～星期日排序）
+    weekday_counts = get_prefix_index().range_stats(start_fmt, end_fmt)["weekday_counts"]
+    return {day: count for day, count in weekday_counts.items() if count > 0}
 
 # 🚀 主程式
 if __name__ == "__main__":
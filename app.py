@@ -1,13 +1,14 @@
 # 📦 匯入模組
-import os
 import sys
 from pathlib import Path
-import subprocess
 
 # 📁 全域設定
 BASE_DIR = Path(__file__).resolve().parent
 DB_PATH = BASE_DIR / "lotto539.db"
 CSV_DIR = BASE_DIR / "data"
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from lotto539.commands import run_command
 
 # 📋 功能選單
 def main_menu():
@@ -26,36 +27,35 @@ def main_menu():
     choice = input("請輸入選項：").strip()
     return choice
 
-# ✅ 執行各子腳本
-def run_script(script_name):
-    script_path = BASE_DIR / script_name
-    if not script_path.exists():
-        print(f"❌ 找不到腳本：{script_name}")
-        return
-    subprocess.run([sys.executable, str(script_path)])
+# 🔢 選項 → 指令名稱（見 lotto539/commands.py）
+MENU_COMMANDS = {
+    "1": "fetch",
+    "2": "import",
+    "3": "summary",
+    "4": "charts",
+    "5": "pdf",
+    "6": "web",
+    "7": "weekly",
+}
 
-# 🚀 主流程
-if __name__ == "__main__":
+# 🚀 主流程（各功能在同一行程內執行，模組與已載入的開獎資料可重複使用）
+def main():
     while True:
         choice = main_menu()
 
-        if choice == "1":
-            run_script("fetch_csv.py")
-        elif choice == "2":
-            run_script("import_csv.py")
-        elif choice == "3":
-            run_script("summary.py")
-        elif choice == "4":
-            run_script("chart_generator.py")
-        elif choice == "5":
-            run_script("pdf_template.py")
-        elif choice == "6":
-            print("🔄 啟動 Streamlit Web 應用...")
-            subprocess.run(["streamlit", "run", "streamlit_app.py"])
-        elif choice == "7":
-            run_script("report/weekly_number_report.py")
-        elif choice == "0":
+        if choice == "0":
             print("👋 感謝使用，再見！")
             break
+        elif choice in MENU_COMMANDS:
+            if choice == "6":
+                print("🔄 啟動 Streamlit Web 應用...")
+            try:
+                run_command(MENU_COMMANDS[choice])
+            except Exception as e:
+                print(f"❌ 發生錯誤：{e}")
         else:
             print("⚠️ 無效選項，請重新輸入")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
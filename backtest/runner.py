@@ -0,0 +1,158 @@
+# 📦 匯入模組
+import sys
+import time
+import argparse
+from itertools import product
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import DrawMatrix, load_draw_matrix
+from analyzer.bitmask import numbers_to_masks, popcount64
+from backtest.strategies import STRATEGIES
+
+TICKET_COST = 50                                      # 每注金額（元）
+PAYOUTS = np.array([0, 0, 50, 300, 20000, 8000000])   # 中 0~5 碼的獎金（頭獎以固定金額估算）
+DEFAULT_MIN_HISTORY = 100                             # 前幾期只累積資料、不下注
+CHUNKSIZE = 8                                         # 每次派給工作行程的設定數
+
+# 🧱 放進共享記憶體的開獎矩陣欄位
+SHARED_FIELDS = ("dates", "weekdays", "numbers")
+
+# 🗂️ 工作行程內掛載的開獎矩陣（由 _init_worker 設定）
+_WORKER_MATRIX = None
+_WORKER_BLOCKS = []
+_WORKER_MIN_HISTORY = DEFAULT_MIN_HISTORY
+
+
+# 🎯 以選號陣列逐期比對開獎結果，統計命中分布與損益
+def evaluate_tickets(tickets, matrix, min_history=DEFAULT_MIN_HISTORY):
+    hits = popcount64(numbers_to_masks(tickets[min_history:]) & matrix.masks[min_history:])
+    distribution = np.bincount(hits.astype(np.intp), minlength=len(PAYOUTS))
+    draws = int(distribution.sum())
+    cost = draws * TICKET_COST
+    payout = int(distribution @ PAYOUTS)
+    return {
+        "draws": draws,
+        "cost": cost,
+        "payout": payout,
+        "net": payout - cost,
+        "roi": round((payout - cost) / cost, 4) if cost else 0.0,
+        "hits": distribution.tolist(),
+    }
+
+
+# 🔁 回測單一策略設定
+def run_backtest(strategy, params=None, matrix=None, min_history=DEFAULT_MIN_HISTORY):
+    if matrix is None:
+        matrix = load_draw_matrix()
+    params = params or {}
+    tickets = STRATEGIES[strategy](matrix, **params)
+    result = evaluate_tickets(tickets, matrix, min_history)
+    return {"strategy": strategy, "params": params, **result}
+
+
+# 🧮 策略 × 參數網格 → 設定清單 [(策略名稱, 參數字典), ...]
+def param_grid(strategy, **grid):
+    names = list(grid)
+    return [(strategy, dict(zip(names, values))) for values in product(*grid.values())]
+
+
+# 🧮 預設掃描網格
+def default_grid():
+    windows = [None, 10, 20, 30, 50, 100, 200, 300, 500]
+    return (
+        param_grid("hot", window=windows, offset=range(35))
+        + param_grid("cold", window=windows, offset=range(35))
+        + param_grid("gap", offset=range(35))
+        + param_grid("random", seed=range(100))
+    )
+
+
+# 📤 將開獎矩陣複製到共享記憶體，回傳（記憶體區塊, 描述）
+def share_matrix(matrix):
+    blocks, spec = [], {}
+    for field in SHARED_FIELDS:
+        array = getattr(matrix, field)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        spec[field] = (block.name, array.shape, array.dtype.str)
+    return blocks, spec
+
+
+# 📥 依描述掛載共享記憶體，直接以唯讀視圖建立開獎矩陣（不複製資料）
+def attach_matrix(spec):
+    blocks, arrays = [], {}
+    for field, (name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=name)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        blocks.append(block)
+        arrays[field] = array
+    return DrawMatrix([], arrays["dates"], arrays["weekdays"], arrays["numbers"]), blocks
+
+
+# 👷 工作行程初始化：掛載一次，之後所有設定共用（衍生結果也快取在這份矩陣上）
+def _init_worker(spec, min_history):
+    global _WORKER_MATRIX, _WORKER_BLOCKS, _WORKER_MIN_HISTORY
+    _WORKER_MATRIX, _WORKER_BLOCKS = attach_matrix(spec)
+    _WORKER_MIN_HISTORY = min_history
+
+
+def _run_config(config):
+    strategy, params = config
+    return run_backtest(strategy, params, _WORKER_MATRIX, _WORKER_MIN_HISTORY)
+
+
+# 🚀 平行掃描多組設定；workers=1 時在本行程執行
+def run_sweep(configs, matrix=None, workers=None, min_history=DEFAULT_MIN_HISTORY, chunksize=CHUNKSIZE):
+    if matrix is None:
+        matrix = load_draw_matrix()
+    if workers == 1:
+        return [run_backtest(strategy, params, matrix, min_history) for strategy, params in configs]
+
+    blocks, spec = share_matrix(matrix)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(spec, min_history)) as executor:
+            return list(executor.map(_run_config, configs, chunksize=chunksize))
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+# 🏷️ 設定名稱（列印用）
+def describe(result):
+    params = ", ".join(f"{k}={v}" for k, v in result["params"].items())
+    return f"{result['strategy']}({params})"
+
+
+# 🚀 主程式
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="今彩539 選號策略歷史回測")
+    parser.add_argument("--workers", type=int, default=None, help="工作行程數（預設為 CPU 核心數，1 表示不開行程）")
+    parser.add_argument("--min-history", type=int, default=DEFAULT_MIN_HISTORY, help="開始下注前需累積的期數")
+    parser.add_argument("--top", type=int, default=10, help="列出淨損益前幾名")
+    args = parser.parse_args(argv)
+
+    matrix = load_draw_matrix()
+    configs = default_grid()
+    print(f"🔁 回測 {len(configs)} 組設定（{len(matrix)} 期，前 {args.min_history} 期不下注）")
+    started = time.perf_counter()
+    results = run_sweep(configs, matrix, args.workers, args.min_history)
+    print(f"⏱️ 耗時：{time.perf_counter() - started:.2f} 秒")
+
+    results.sort(key=lambda r: r["net"], reverse=True)
+    print(f"\n🏆 淨損益前 {args.top} 名：")
+    for result in results[:args.top]:
+        print(f"  {describe(result):<28} 淨損益 {result['net']:>10,} 元｜ROI {result['roi']:+.2%}｜命中 {result['hits']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# 📦 匯入模組
+import sys
+from pathlib import Path
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import MAX_NUMBER, NUMBERS_PER_DRAW
+
+# 🎫 每個策略一次產生「每一期」的選號，回傳 (N, 5)：
+#    第 t 列只能使用第 t 期以前（不含當期）的資料，回測時再與第 t 期開獎比對
+
+
+# 🔢 依分數排名取第 offset 名起的 5 個號碼（分數相同時號碼小者在前）
+def pick_by_score(scores, offset=0, ascending=False):
+    keys = scores if ascending else -scores
+    order = np.argsort(keys, axis=1, kind="stable")
+    return (order[:, offset:offset + NUMBERS_PER_DRAW] + 1).astype(np.uint8)
+
+
+# 🪟 每期開獎前、往前 window 期的出現次數（window=None 表示全部歷史），回傳 (N, 39)
+def counts_before(matrix, window=None):
+    key = f"counts_before_{window}"
+    if key in matrix.derived:
+        return matrix.derived[key]
+
+    prefix = matrix.number_prefix
+    end = np.arange(len(matrix))
+    start = np.zeros_like(end) if window is None else np.maximum(end - window, 0)
+    counts = prefix[end] - prefix[start]
+    matrix.derived[key] = counts
+    return counts
+
+
+# 📏 每期開獎前各號碼的遺漏期數（與 analyze_single_number 的 current_gap 相同定義），回傳 (N, 39)
+def gaps_before(matrix):
+    if "gaps_before" in matrix.derived:
+        return matrix.derived["gaps_before"]
+
+    total = len(matrix)
+    seen = np.where(matrix.incidence, np.arange(total)[:, None], -1)
+    last_seen = np.maximum.accumulate(seen, axis=0) if total else seen
+    # 第 t 期開獎前最後一次出現的位置為 last_seen[t-1]；從未出現視為 -1，遺漏期數即為 t
+    previous = np.vstack([np.full((1, MAX_NUMBER), -1), last_seen[:-1]])
+    gaps = np.arange(total)[:, None] - 1 - previous
+    matrix.derived["gaps_before"] = gaps
+    return gaps
+
+
+# 🔥 熱號：近 window 期出現次數最多者
+def hot_numbers(matrix, window=None, offset=0):
+    return pick_by_score(counts_before(matrix, window), offset)
+
+
+# ❄️ 冷號：近 window 期出現次數最少者
+def cold_numbers(matrix, window=None, offset=0):
+    return pick_by_score(counts_before(matrix, window), offset, ascending=True)
+
+
+# ⏳ 遺漏：目前間隔期數最大者
+def largest_gap(matrix, offset=0):
+    return pick_by_score(gaps_before(matrix), offset)
+
+
+# 🎲 隨機選號（對照組）
+def random_numbers(matrix, seed=0):
+    rng = np.random.default_rng(seed)
+    drawn = np.argpartition(rng.random((len(matrix), MAX_NUMBER)), NUMBERS_PER_DRAW, axis=1)
+    return (drawn[:, :NUMBERS_PER_DRAW] + 1).astype(np.uint8)
+
+
+# 🗂️ 策略名稱對照表
+STRATEGIES = {
+    "hot": hot_numbers,
+    "cold": cold_numbers,
+    "gap": largest_gap,
+    "random": random_numbers,
+}
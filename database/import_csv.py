@@ -1,57 +1,216 @@
 # 📦 匯入模組
+import sys
 import sqlite3
 import csv
+import argparse
 from pathlib import Path
-from datetime import datetime
+from datetime import date
 
 # 📁 全域變數
 BASE_DIR = Path(__file__).resolve().parent.parent
 DB_PATH = BASE_DIR / "lotto539.db"
 DATA_DIR = BASE_DIR / "data"
 LATEST_PATH_FILE = DATA_DIR / ".latest_csv_path"
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import WEEKDAY_NAMES
+from analyzer.stats_cache import refresh_stats_cache
+from database.init_db import DRAW_DAY_SQL, MASK_SQL, ensure_schema, sync_draw_numbers
+
+CHUNK_SIZE = 10000
+TAIL_BLOCK_SIZE = 8192
+
+# 🧱 暫存表：整批寫入後再一次合併進 lotto539
+CREATE_STAGING_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS lotto539_staging (
+    period TEXT NOT NULL,
+    draw_date TEXT NOT NULL,
+    weekday TEXT NOT NULL,
+    no1 INTEGER NOT NULL,
+    no2 INTEGER NOT NULL,
+    no3 INTEGER NOT NULL,
+    no4 INTEGER NOT NULL,
+    no5 INTEGER NOT NULL
+);
+"""
 
 # 🔍 從 latest_csv_path 取得最新 CSV 路徑
-if not LATEST_PATH_FILE.exists():
-    print("[ERROR] 找不到 .latest_csv_path 檔案")
-    exit()
+def get_latest_csv_path():
+    if not LATEST_PATH_FILE.exists():
+        print("[ERROR] 找不到 .latest_csv_path 檔案")
+        return None
+
+    with open(LATEST_PATH_FILE, "r", encoding="utf-8") as f:
+        latest_csv = Path(f.read().strip())
 
-with open(LATEST_PATH_FILE, "r", encoding="utf-8") as f:
-    latest_csv = Path(f.read().strip())
+    if not latest_csv.exists():
+        print(f"[ERROR] 指定的 CSV 檔案不存在：{latest_csv}")
+        return None
+    return latest_csv
 
-if not latest_csv.exists():
-    print(f"[ERROR] 指定的 CSV 檔案不存在：{latest_csv}")
-    exit()
+# 🧾 解析單列 CSV：2007/01/01,096001,27,38,09,11,28,...
+def parse_csv_row(row):
+    iso_date = row[0].strip().replace("/", "-")
+    try:
+        draw_day = date.fromisoformat(iso_date)
+    except ValueError:
+        # 月、日未補零時（如 2007/1/1）改用逐段解析
+        year, month, day = iso_date.split("-")
+        draw_day = date(int(year), int(month), int(day))
+    return (
+        row[1].strip(), draw_day.isoformat(), WEEKDAY_NAMES[draw_day.weekday()],
+        int(row[2]), int(row[3]), int(row[4]), int(row[5]), int(row[6]),
+    )
+
+# 📚 分批讀取 CSV，每批最多 chunk_size 列
+def iter_csv_chunks(csv_path, chunk_size=CHUNK_SIZE):
+    with open(csv_path, "r", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        chunk = []
+        for line_no, row in enumerate(reader, start=1):
+            if not row:
+                continue
+            try:
+                chunk.append(parse_csv_row(row))
+            except (ValueError, IndexError) as e:
+                # 第一列無法解析時視為標題列
+                if line_no > 1:
+                    print(f"[WARN] 匯入失敗（期別 {row[1] if len(row) > 1 else '?'}）：{e}")
+                continue
 
-print(f"[INFO] 讀取 CSV 檔案：{latest_csv}")
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
 
-with sqlite3.connect(DB_PATH) as conn:
+# 🔖 資料庫目前最新的期別與開獎日期
+def get_import_watermark(conn):
     cursor = conn.cursor()
-    inserted, skipped = 0, 0
+    cursor.execute("SELECT MAX(period), MAX(draw_date) FROM lotto539")
+    return cursor.fetchone()
 
-    with open(latest_csv, "r", encoding="utf-8-sig") as f:
-        reader = csv.reader(f)
-        next(reader)  # 跳過標題列
+# ⏪ 從檔尾往前讀取，遇到資料庫已有的期別即停止（只補齊最新已知期別之後的列）
+#    比最新已知期別更早的缺漏期數不會被讀到，需以 --full 重新解析整份 CSV
+def read_csv_tail(csv_path, conn, block_size=TAIL_BLOCK_SIZE):
+    cursor = conn.cursor()
+    rows = []
+    with open(csv_path, "rb") as f:
+        f.seek(0, 2)
+        position = f.tell()
+        pending = b""
+        done = False
 
-        for row in reader:
-            try:
-                draw_date = datetime.strptime(row[0].strip(), "%Y/%m/%d").strftime("%Y-%m-%d")
-                period = row[1].strip()
-                numbers = [int(row[i]) for i in range(2, 7)]
-                weekday = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"][datetime.strptime(draw_date, "%Y-%m-%d").weekday()]
+        while not done:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + pending).split(b"\n")
+            # 尚未讀到檔頭時，第一段可能只是某列的後半，留到下一輪補齊
+            pending = lines.pop(0) if position > 0 else b""
+
+            for index in range(len(lines) - 1, -1, -1):
+                line = lines[index].decode("utf-8-sig").strip()
+                if not line:
+                    continue
+                row = next(csv.reader([line]))
+                try:
+                    parsed = parse_csv_row(row)
+                except (ValueError, IndexError) as e:
+                    # 檔案第一列無法解析時視為標題列
+                    if position > 0 or index > 0:
+                        print(f"[WARN] 匯入失敗（期別 {row[1] if len(row) > 1 else '?'}）：{e}")
+                    continue
+                cursor.execute("SELECT 1 FROM lotto539 WHERE period = ?", (parsed[0],))
+                if cursor.fetchone():
+                    done = True
+                    break
+                rows.append(parsed)
+
+            if position == 0:
+                done = True
 
-                cursor.execute("""
-                    INSERT OR IGNORE INTO lotto539
-                    (period, draw_date, weekday, no1, no2, no3, no4, no5)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (period, draw_date, weekday, *numbers))
+    rows.reverse()
+    return rows
 
-                if cursor.rowcount:
-                    inserted += 1
-                else:
-                    skipped += 1
+# 🚚 批次匯入：executemany 寫入暫存表，再以單一 INSERT ... SELECT 合併
+def bulk_import(conn, chunks):
+    cursor = conn.cursor()
+    cursor.execute(CREATE_STAGING_SQL)
+    cursor.execute("DELETE FROM lotto539_staging")
+
+    for chunk in chunks:
+        cursor.executemany("""
+            INSERT INTO lotto539_staging
+            (period, draw_date, weekday, no1, no2, no3, no4, no5)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, chunk)
 
-            except Exception as e:
-                print(f"[WARN] 匯入失敗（期別 {row[1]}）：{e}")
+    # 新增 = 暫存期別 − 既有期別；跳過 = 其餘列（已存在或 CSV 內重複）
+    cursor.execute("SELECT COUNT(*), COUNT(DISTINCT period) FROM lotto539_staging")
+    staged_rows, staged_periods = cursor.fetchone()
+    cursor.execute("""
+        SELECT COUNT(DISTINCT s.period)
+        FROM lotto539_staging s JOIN lotto539 l ON l.period = s.period
+    """)
+    existing = cursor.fetchone()[0]
 
+    cursor.execute(f"""
+        INSERT OR IGNORE INTO lotto539
+        (period, draw_date, weekday, no1, no2, no3, no4, no5, draw_day, mask)
+        SELECT period, draw_date, weekday, no1, no2, no3, no4, no5, {DRAW_DAY_SQL}, {MASK_SQL}
+        FROM lotto539_staging
+        WHERE period NOT IN (SELECT period FROM lotto539)
+        ORDER BY draw_date, period
+    """)
+    cursor.execute("DROP TABLE lotto539_staging")
+    sync_draw_numbers(conn)
     conn.commit()
+
+    inserted = staged_periods - existing
+    return inserted, staged_rows - inserted
+
+# 🚀 匯入指定 CSV 至資料庫（預設只讀取比資料庫更新的尾段）
+def import_csv(csv_path, db_path=DB_PATH, chunk_size=CHUNK_SIZE, full=False):
+    print(f"[INFO] 讀取 CSV 檔案：{csv_path}")
+    with sqlite3.connect(db_path) as conn:
+        ensure_schema(conn)
+        last_period, last_date = get_import_watermark(conn)
+
+        if full or last_date is None:
+            chunks = iter_csv_chunks(csv_path, chunk_size)
+        else:
+            tail_rows = read_csv_tail(csv_path, conn)
+            print(f"[INFO] 資料庫最新期別 {last_period}（{last_date}），僅讀取檔尾 {len(tail_rows)} 列")
+            print("[INFO] 增量匯入只補齊檔尾；若較早的期數有缺漏，請加上 --full 重新匯入整份 CSV")
+            chunks = [tail_rows]
+
+        inserted, skipped = bulk_import(conn, chunks)
     print(f"[INFO] 匯入完成：新增 {inserted} 筆，跳過 {skipped} 筆（已存在）")
+
+    # 🧮 只將新增的期數納入累計統計
+    stats = refresh_stats_cache(db_path)
+    print(f"[INFO] 累計統計已更新：共 {stats['total_rows']} 期")
+    return inserted, skipped
+
+# 🚀 主程式
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="匯入今彩539 CSV 至資料庫")
+    parser.add_argument("csv_path", nargs="?", help="CSV 檔案路徑（預設讀取 .latest_csv_path）")
+    parser.add_argument("--db", default=str(DB_PATH), help="SQLite 資料庫路徑")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="每批寫入的列數")
+    parser.add_argument("--full", action="store_true", help="重新解析整份 CSV（不使用增量匯入；補齊較早期數的缺漏時需要）")
+    args = parser.parse_args(argv)
+
+    csv_path = Path(args.csv_path) if args.csv_path else get_latest_csv_path()
+    if csv_path is None:
+        return 1
+    if not csv_path.exists():
+        print(f"[ERROR] 指定的 CSV 檔案不存在：{csv_path}")
+        return 1
+
+    import_csv(csv_path, Path(args.db), args.chunk_size, args.full)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
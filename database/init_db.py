@@ -1,11 +1,19 @@
 # 📦 匯入套件
+import sys
 import sqlite3
+import argparse
 import os
 from pathlib import Path
+from datetime import date
 
 # 📁 全域變數設定
 BASE_DIR = Path(__file__).resolve().parent.parent
 DB_PATH = BASE_DIR / "lotto539.db"
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+# 🗂️ 本行程已確認過結構的資料庫路徑
+_SCHEMA_READY = set()
 
 # 🧱 建立資料表的 SQL 指令
 CREATE_TABLE_SQL = """
@@ -19,10 +27,145 @@ CREATE TABLE IF NOT EXISTS lotto539 (
     no3 INTEGER NOT NULL,
     no4 INTEGER NOT NULL,
     no5 INTEGER NOT NULL,
-    remark TEXT DEFAULT ''
+    remark TEXT DEFAULT '',
+    draw_day INTEGER,
+    mask INTEGER
 );
 """
 
+# 🧱 號碼出現明細（長格式）：每期 5 列，供單一號碼以索引範圍查詢
+CREATE_DRAW_NUMBERS_SQL = """
+CREATE TABLE IF NOT EXISTS draw_numbers (
+    draw_id INTEGER NOT NULL,
+    number INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    draw_seq INTEGER,
+    PRIMARY KEY (draw_id, position)
+) WITHOUT ROWID;
+"""
+
+# 🔄 補齊 draw_numbers：lotto539.id 為 AUTOINCREMENT，只需處理大於已同步最大 id 的期數
+SYNC_DRAW_NUMBERS_SQL = """
+INSERT OR IGNORE INTO draw_numbers (draw_id, number, position)
+SELECT id, no1, 1 FROM lotto539 WHERE id > :last_id
+UNION ALL SELECT id, no2, 2 FROM lotto539 WHERE id > :last_id
+UNION ALL SELECT id, no3, 3 FROM lotto539 WHERE id > :last_id
+UNION ALL SELECT id, no4, 4 FROM lotto539 WHERE id > :last_id
+UNION ALL SELECT id, no5, 5 FROM lotto539 WHERE id > :last_id
+"""
+
+# 🔢 draw_seq：期數依開獎日期排序的序號（0 起算），同一號碼相鄰兩次出現的序號差即為間隔期數
+#    :after 之後的期數自 :base 起依序編號（追加新期數時只編新的一段，插入較早期數時全部重編）
+NUMBER_DRAW_SEQ_SQL = """
+UPDATE draw_numbers SET draw_seq = ranked.seq
+FROM (
+    SELECT id, :base + ROW_NUMBER() OVER (ORDER BY draw_date, period) - 1 AS seq
+    FROM lotto539 WHERE draw_date > :after
+) AS ranked
+WHERE draw_numbers.draw_id = ranked.id
+"""
+
+# 📅 draw_day：自 1970-01-01 起算的天數（與 numpy datetime64[D] 相同）
+DRAW_DAY_SQL = "CAST(julianday(draw_date) - 2440587.5 AS INTEGER)"
+EPOCH = date(1970, 1, 1)
+
+# 🎭 mask：號碼位元遮罩，第 n 位代表號碼 n（與 analyzer/bitmask.py 相同）
+MASK_SQL = "((1 << no1) | (1 << no2) | (1 << no3) | (1 << no4) | (1 << no5))"
+
+# 🗂️ 索引：日期區間查詢與排序可直接走覆蓋索引，不必回表
+CREATE_INDEX_SQLS = [
+    """
+    CREATE INDEX IF NOT EXISTS idx_lotto539_draw_date
+    ON lotto539 (draw_date, weekday, no1, no2, no3, no4, no5, period)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_lotto539_draw_day
+    ON lotto539 (draw_day)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_draw_numbers_number
+    ON draw_numbers (number, draw_id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_draw_numbers_seq
+    ON draw_numbers (number, draw_seq)
+    """,
+]
+
+# 🔄 建立資料表並補上新欄位與索引（可重複執行）
+def ensure_schema(conn):
+    cursor = conn.cursor()
+    cursor.execute(CREATE_TABLE_SQL)
+
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(lotto539)")}
+    if "draw_day" not in columns:
+        cursor.execute("ALTER TABLE lotto539 ADD COLUMN draw_day INTEGER")
+    cursor.execute(f"UPDATE lotto539 SET draw_day = {DRAW_DAY_SQL} WHERE draw_day IS NULL")
+    if "mask" not in columns:
+        cursor.execute("ALTER TABLE lotto539 ADD COLUMN mask INTEGER")
+    cursor.execute(f"UPDATE lotto539 SET mask = {MASK_SQL} WHERE mask IS NULL")
+
+    cursor.execute(CREATE_DRAW_NUMBERS_SQL)
+    if "draw_seq" not in {row[1] for row in cursor.execute("PRAGMA table_info(draw_numbers)")}:
+        cursor.execute("ALTER TABLE draw_numbers ADD COLUMN draw_seq INTEGER")
+        number_draws(conn, 0)
+    for sql in CREATE_INDEX_SQLS:
+        cursor.execute(sql)
+    sync_draw_numbers(conn)
+    conn.commit()
+
+# 📅 YYYY-MM-DD → draw_day（與 DRAW_DAY_SQL 相同）
+def to_draw_day(iso_date):
+    return (date.fromisoformat(iso_date) - EPOCH).days
+
+# 🔌 開啟資料庫連線；每個行程第一次連到某個資料庫時先補齊結構與 draw_numbers（舊資料庫自動遷移）
+def connect_db(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path)
+    key = str(Path(db_path).resolve())
+    if key not in _SCHEMA_READY:
+        ensure_schema(conn)
+        _SCHEMA_READY.add(key)
+    return conn
+
+# 🔄 將尚未展開的期數寫入 draw_numbers（由匯入程式在合併後呼叫）
+def sync_draw_numbers(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT COALESCE(MAX(draw_id), 0) FROM draw_numbers")
+    last_id = cursor.fetchone()[0]
+    cursor.execute(SYNC_DRAW_NUMBERS_SQL, {"last_id": last_id})
+    inserted = cursor.rowcount
+    if inserted:
+        number_draws(conn, last_id)
+    return inserted
+
+# 🔢 為 id > last_id 的新期數編 draw_seq：新期數都比既有期數晚時只往後追加，否則全部重編
+def number_draws(conn, last_id):
+    cursor = conn.cursor()
+    cursor.execute("SELECT MAX(draw_date) FROM lotto539 WHERE id <= ?", (last_id,))
+    numbered_until = cursor.fetchone()[0]
+    cursor.execute("SELECT MIN(draw_date) FROM lotto539 WHERE id > ?", (last_id,))
+    first_new = cursor.fetchone()[0]
+
+    if numbered_until is not None and first_new is not None and first_new > numbered_until:
+        cursor.execute("SELECT COALESCE(MAX(draw_seq) + 1, 0) FROM draw_numbers")
+        params = {"base": cursor.fetchone()[0], "after": numbered_until}
+    else:
+        params = {"base": 0, "after": ""}
+    cursor.execute(NUMBER_DRAW_SEQ_SQL, params)
+
+# 🔎 以 EXPLAIN QUERY PLAN 確認常用查詢皆走索引，回傳未通過的項目
+#    checks：[(說明, SQL, 參數, 必須出現的計畫片段), ...]，預設為 database/query.py 實際執行的查詢
+def verify_query_plans(conn, checks=None):
+    if checks is None:
+        from database.query import QUERY_PLAN_CHECKS as checks
+
+    failures = []
+    for label, sql, params, expected in checks:
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        if not any(expected in detail for detail in plan) or any("TEMP B-TREE" in detail for detail in plan):
+            failures.append((label, plan))
+    return failures
+
 # 🔧 初始化資料庫函式
 def initialize_database():
     try:
@@ -30,15 +173,31 @@ def initialize_database():
             print(f"✔️ 資料庫已存在：{DB_PATH}")
         else:
             print(f"📂 建立資料庫：{DB_PATH}")
-        
+
         with sqlite3.connect(DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(CREATE_TABLE_SQL)
-            conn.commit()
-            print("✅ 資料表建立完成（或已存在）")
+            ensure_schema(conn)
+            print("✅ 資料表與索引建立完成（或已存在）")
     except sqlite3.Error as e:
         print(f"❌ 資料庫初始化失敗：{e}")
 
 # 🚀 主程式入口點
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="建立 / 更新今彩539 資料庫結構")
+    parser.add_argument("--check", action="store_true", help="檢查常用查詢是否走預期索引")
+    args = parser.parse_args(argv)
+
     initialize_database()
+
+    # python database/init_db.py --check：檢查查詢計畫
+    if args.check:
+        with sqlite3.connect(DB_PATH) as conn:
+            failures = verify_query_plans(conn)
+        for label, plan in failures:
+            print(f"❌ {label} 未使用預期索引：{plan}")
+        if failures:
+            return 1
+        print("✅ 查詢計畫檢查通過")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
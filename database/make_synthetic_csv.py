@@ -0,0 +1,46 @@
+# 📦 匯入模組
+import csv
+import argparse
+from pathlib import Path
+from datetime import date, timedelta
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = BASE_DIR / "data" / "synthetic_lotto539.csv"
+BATCH_SIZE = 100000
+
+# 🎲 產生與官方 CSV 相同格式的模擬開獎資料（壓力測試用）
+def write_synthetic_csv(path, rows, seed=539, start=date(2007, 1, 1)):
+    rng = np.random.default_rng(seed)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        for offset in range(0, rows, BATCH_SIZE):
+            size = min(BATCH_SIZE, rows - offset)
+            # 每列取 39 個亂數的前 5 小索引，等同不重複抽出 5 個號碼
+            drawn = np.argpartition(rng.random((size, 39)), 5, axis=1)[:, :5] + 1
+            ordered = np.sort(drawn, axis=1)
+            for i in range(size):
+                index = offset + i
+                draw_date = (start + timedelta(days=index)).strftime("%Y/%m/%d")
+                writer.writerow(
+                    [draw_date, f"{index + 1:07d}"]
+                    + [f"{n:02d}" for n in drawn[i]]
+                    + [" "]
+                    + [f"{n:02d}" for n in ordered[i]]
+                )
+    return path
+
+# 🚀 主程式
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="產生模擬今彩539 CSV")
+    parser.add_argument("--rows", type=int, default=1000000, help="產生列數")
+    parser.add_argument("--out", default=str(DEFAULT_OUTPUT), help="輸出檔案路徑")
+    parser.add_argument("--seed", type=int, default=539, help="亂數種子")
+    args = parser.parse_args()
+
+    output = write_synthetic_csv(args.out, args.rows, args.seed)
+    print(f"[INFO] 已產生 {args.rows} 列模擬資料：{output}")
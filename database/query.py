@@ -1,12 +1,90 @@
 # 📦 匯入模組
-import sqlite3
+import sys
 from collections import Counter
 from pathlib import Path
 from datetime import datetime
 
 # 📁 全域設定
-BASE_DIR = Path(__file__).resolve().parent
+BASE_DIR = Path(__file__).resolve().parent.parent
 DB_PATH = BASE_DIR / "lotto539.db"
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.prefix_index import get_prefix_index
+from analyzer.draw_matrix import DRAW_COLUMNS_SQL, load_draw_matrix
+from analyzer.bitmask import consecutive_pairs, ticket_mask
+from database.init_db import connect_db, to_draw_day
+
+# 📅 日期區間查詢：以整數 draw_day 走 idx_lotto539_draw_day 範圍掃描
+DATE_RANGE_SQL = """
+    SELECT period, draw_date, weekday, no1, no2, no3, no4, no5
+    FROM lotto539
+    WHERE draw_day BETWEEN ? AND ?
+    ORDER BY draw_day
+"""
+
+# 🎯 單一號碼的查詢：皆為 (number, draw_seq) 索引範圍掃描
+NUMBER_LAST_SEEN_SQL = """
+    SELECT l.period, l.draw_date
+    FROM draw_numbers d JOIN lotto539 l ON l.id = d.draw_id
+    WHERE d.number = ?
+    ORDER BY d.draw_seq DESC
+    LIMIT 1
+"""
+NUMBER_DRAWS_SQL = """
+    SELECT l.period, l.draw_date
+    FROM draw_numbers d JOIN lotto539 l ON l.id = d.draw_id
+    WHERE d.number = ?
+    ORDER BY d.draw_seq
+"""
+NUMBER_SEQ_SQL = "SELECT draw_seq FROM draw_numbers WHERE number = ? ORDER BY draw_seq"
+
+# 🤝 count 個號碼同期開出的次數（參數依序為第 2…count 個號碼，最後是第 1 個號碼）
+def cooccurrence_sql(count):
+    joins = " ".join(
+        f"JOIN draw_numbers d{i} ON d{i}.draw_id = d0.draw_id AND d{i}.number = ?"
+        for i in range(1, count)
+    )
+    return f"SELECT COUNT(*) FROM draw_numbers d0 {joins} WHERE d0.number = ?"
+
+# 🔎 查詢計畫檢查：(說明, SQL, 參數, 必須出現的計畫片段)，皆為程式實際執行的查詢
+QUERY_PLAN_CHECKS = [
+    (
+        "日期區間查詢",
+        DATE_RANGE_SQL,
+        (19723, 20088),
+        "USING INDEX idx_lotto539_draw_day",
+    ),
+    (
+        "開獎矩陣載入",
+        DRAW_COLUMNS_SQL + " ORDER BY draw_date",
+        (),
+        "USING COVERING INDEX idx_lotto539_draw_date",
+    ),
+    (
+        "單一號碼最近一次出現",
+        NUMBER_LAST_SEEN_SQL,
+        (17,),
+        "USING COVERING INDEX idx_draw_numbers_seq",
+    ),
+    (
+        "單一號碼出現期別",
+        NUMBER_DRAWS_SQL,
+        (17,),
+        "USING COVERING INDEX idx_draw_numbers_seq",
+    ),
+    (
+        "單一號碼間隔序列",
+        NUMBER_SEQ_SQL,
+        (17,),
+        "USING COVERING INDEX idx_draw_numbers_seq",
+    ),
+    (
+        "號碼同期開出次數",
+        cooccurrence_sql(2),
+        (23, 17),
+        "USING COVERING INDEX idx_draw_numbers_number",
+    ),
+]
 
 # ⏱️ 輔助函式：標準化使用者輸入的日期格式
 def normalize_date(input_str):
@@ -19,7 +97,7 @@ def normalize_date(input_str):
 
 # 🔍 取得所有號碼資料
 def fetch_all_numbers():
-    with sqlite3.connect(DB_PATH) as conn:
+    with connect_db(DB_PATH) as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
         return [num for row in cursor.fetchall() for num in row]
@@ -45,16 +123,21 @@ def query_odd_even_ratio():
 
 # 🔗 連號出現次數
 def query_consecutive_count():
-    with sqlite3.connect(DB_PATH) as conn:
+    # 遮罩中相鄰位元即連號：popcount(mask & (mask >> 1))
+    return int(consecutive_pairs(load_draw_matrix().masks).sum())
+
+# 🎭 同時開出指定號碼的所有期別（以 mask 欄位位元運算比對）
+def query_draws_containing(*numbers):
+    mask = int(ticket_mask(numbers))
+    with connect_db(DB_PATH) as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        consecutive_total = 0
-        for row in cursor.fetchall():
-            sorted_nums = sorted(row)
-            for i in range(4):
-                if sorted_nums[i] + 1 == sorted_nums[i + 1]:
-                    consecutive_total += 1
-        return consecutive_total
+        cursor.execute("""
+            SELECT period, draw_date, weekday, no1, no2, no3, no4, no5
+            FROM lotto539
+            WHERE mask & ? = ?
+            ORDER BY draw_date
+        """, (mask, mask))
+        return cursor.fetchall()
 
 # 📅 區間查詢統計（含星期統計）
 def query_by_date_range(start_date: str, end_date: str):
@@ -65,16 +148,52 @@ def query_by_date_range(start_date: str, end_date: str):
         print(e)
         return []
 
-    with sqlite3.connect(DB_PATH) as conn:
+    with connect_db(DB_PATH) as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT period, draw_date, weekday, no1, no2, no3, no4, no5
-            FROM lotto539
-            WHERE draw_date BETWEEN ? AND ?
-            ORDER BY draw_date
-        """, (start_date_fmt, end_date_fmt))
+        cursor.execute(DATE_RANGE_SQL, (to_draw_day(start_date_fmt), to_draw_day(end_date_fmt)))
         return cursor.fetchall()
 
+# 📊 任意日期區間的統計（號碼、奇偶、尾數、區段、星期），由前綴索引直接相減取得
+def query_range_stats(start_date=None, end_date=None):
+    try:
+        start_date_fmt = normalize_date(start_date) if start_date else None
+        end_date_fmt = normalize_date(end_date) if end_date else None
+    except ValueError as e:
+        print(e)
+        return {}
+
+    return get_prefix_index().range_stats(start_date_fmt, end_date_fmt)
+
+# 🎯 單一號碼最近一次出現（走 draw_numbers 的號碼索引）
+def query_number_last_seen(number):
+    with connect_db(DB_PATH) as conn:
+        cursor = conn.cursor()
+        cursor.execute(NUMBER_LAST_SEEN_SQL, (int(number),))
+        return cursor.fetchone()
+
+# 📜 單一號碼所有出現期別（依日期由舊到新）
+def query_number_draws(number):
+    with connect_db(DB_PATH) as conn:
+        cursor = conn.cursor()
+        cursor.execute(NUMBER_DRAWS_SQL, (int(number),))
+        return cursor.fetchall()
+
+# 📏 單一號碼的間隔序列（相鄰兩次出現相差的期數，由舊到新）
+def query_number_gap_series(number):
+    with connect_db(DB_PATH) as conn:
+        cursor = conn.cursor()
+        cursor.execute(NUMBER_SEQ_SQL, (int(number),))
+        seqs = [row[0] for row in cursor.fetchall()]
+    return [b - a for a, b in zip(seqs, seqs[1:])]
+
+# 🤝 兩個（或以上）號碼同期開出的次數
+def query_cooccurrence_count(*numbers):
+    numbers = sorted({int(n) for n in numbers})
+    with connect_db(DB_PATH) as conn:
+        cursor = conn.cursor()
+        cursor.execute(cooccurrence_sql(len(numbers)), (*numbers[1:], numbers[0]))
+        return cursor.fetchone()[0]
+
 # 🚀 主程式範例執行（可依功能選用）
 if __name__ == "__main__":
     print("📊 熱門號碼：")
@@ -95,3 +214,11 @@ if __name__ == "__main__":
     results = query_by_date_range("2024/01/01", "2024/12/31")
     for row in results[:3]:
         print(row)
+
+    print("\n📊 2024年區間統計：")
+    stats = query_range_stats("2024/01/01", "2024/12/31")
+    print(f"共 {stats['total_draws']} 期，奇偶 {stats['odd']}:{stats['even']}，星期 {stats['weekday_counts']}")
+
+    print("\n🎯 號碼 17 最近一次出現：")
+    print(query_number_last_seen(17))
+    print(f"🤝 號碼 17 與 23 同期開出：{query_cooccurrence_count(17, 23)} 次")
@@ -1,3 +1,5 @@
+import sys
+import argparse
 import requests
 from pathlib import Path
 from datetime import datetime
@@ -37,5 +39,9 @@ def fetch_lotto_csv():
         return None
 
 # 🚀 主程式入口
+def main(argv=None):
+    argparse.ArgumentParser(description="下載今彩539 最新 CSV").parse_args(argv)
+    return 0 if fetch_lotto_csv() else 1
+
 if __name__ == "__main__":
-    fetch_lotto_csv()
+    sys.exit(main())
@@ -0,0 +1,27 @@
+# 📦 匯入模組
+import sys
+from pathlib import Path
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from lotto539.commands import COMMANDS, print_commands, run_command
+
+
+# 🚀 非互動式入口：python -m lotto539 <指令> [參數]（適合排程使用）
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print("用法：python -m lotto539 <指令> [參數]")
+        print_commands()
+        return 0
+    if argv[0] not in COMMANDS:
+        print(f"❌ 未知的指令：{argv[0]}")
+        print_commands()
+        return 2
+    return run_command(argv[0], argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
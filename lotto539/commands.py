@@ -0,0 +1,72 @@
+# 📦 匯入模組
+import sys
+import time
+import importlib
+import subprocess
+from pathlib import Path
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+# 📋 指令表：名稱 → (模組, 進入函式, 說明)
+#    模組在第一次執行該指令時才匯入，之後重複使用（開獎矩陣等快取也留在同一行程）
+COMMANDS = {
+    "fetch": ("downloader.fetch_csv", "main", "下載最新 CSV 資料"),
+    "import": ("database.import_csv", "main", "匯入 CSV 到資料庫"),
+    "init-db": ("database.init_db", "main", "建立 / 更新資料庫結構"),
+    "summary": ("analyzer.summary", "main", "執行統計摘要分析"),
+    "charts": ("report.chart_generator", "main", "產出圖表"),
+    "gaps": ("report.gap_charts", "main", "批次輸出 39 個號碼的間隔趨勢圖"),
+    "pdf": ("report.pdf_template", "main", "產出 PDF 報告"),
+    "weekly": ("report.weekly_number_report", "main", "產出每週號碼統計 PDF 報表"),
+    "backtest": ("backtest.runner", "main", "選號策略歷史回測"),
+    "randomness": ("analyzer.randomness", "main", "隨機性檢定（蒙地卡羅）"),
+    "cache": ("analyzer.result_cache", "main", "查看 / 清除分析結果快取"),
+    "web": (None, None, "啟動 Web 介面（Streamlit）"),
+}
+
+# 🗂️ 已載入的進入函式
+_LOADED = {}
+
+
+# 📥 取得指令的進入函式（延遲匯入，只匯入一次）
+def load_command(name):
+    if name not in _LOADED:
+        module_name, func_name, _ = COMMANDS[name]
+        _LOADED[name] = getattr(importlib.import_module(module_name), func_name)
+    return _LOADED[name]
+
+
+# 🌐 Streamlit 是獨立的伺服器行程，仍以子行程啟動
+def run_streamlit(argv=None):
+    return subprocess.run([sys.executable, "-m", "streamlit", "run", str(BASE_DIR / "streamlit_app.py"), *(argv or [])]).returncode
+
+
+# 🚀 執行指令，回傳結束代碼（0 為成功）
+def run_command(name, argv=None):
+    if name not in COMMANDS:
+        print(f"❌ 未知的指令：{name}")
+        return 2
+    if name == "web":
+        return run_streamlit(argv)
+
+    started = time.perf_counter()
+    try:
+        code = load_command(name)(argv or [])
+    except SystemExit as e:
+        # argparse 的 --help / 參數錯誤會呼叫 sys.exit，不讓它結束整個選單
+        code = e.code
+    except ImportError as e:
+        print(f"❌ 無法載入 {name} 所需模組：{e}")
+        return 1
+    print(f"⏱️ {name} 耗時 {time.perf_counter() - started:.2f} 秒")
+    return code or 0
+
+
+# 📋 列出所有指令
+def print_commands():
+    print("可用指令：")
+    for name, (_, _, description) in COMMANDS.items():
+        print(f"  {name:<12}{description}")
@@ -1,107 +1,201 @@
 # 📦 匯入模組
-import sqlite3
-from collections import Counter
+import os
+import sys
+import json
+import hashlib
+import argparse
 from pathlib import Path
-from datetime import datetime
-import matplotlib
-import matplotlib.pyplot as plt
-from style import apply_global_matplotlib_style
-apply_global_matplotlib_style()
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 
 # 📁 全域變數
 BASE_DIR = Path(__file__).resolve().parent
-DB_PATH = BASE_DIR / "lotto539.db"
 IMG_DIR = BASE_DIR / "charts"
 IMG_DIR.mkdir(exist_ok=True)
+MANIFEST_PATH = IMG_DIR / "chart_hashes.json"  # 圖檔名 → 上次輸出時的內容雜湊
+if str(BASE_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR.parent))
+from report.style import apply_global_matplotlib_style
+apply_global_matplotlib_style()
+from report.figures import bar_figure, pie_figure, timeline_figure
+from analyzer.draw_matrix import load_draw_matrix
+from analyzer.range_segment import get_segments
+from analyzer.hot_cold import get_hot_and_cold_timeline
+from analyzer.rolling_window import DEFAULT_WINDOWS
+from analyzer.result_cache import cached_result, code_digest
+
+TIMELINE_DRAWS = 300  # 熱度時間軸顯示最近幾期
+# 🧬 共用繪圖程式版本：figures.py（畫法）與 style.py（樣式）的原始碼雜湊
+RENDER_SOURCES = [BASE_DIR / "figures.py", BASE_DIR / "style.py"]
+RENDER_VERSION = hashlib.sha256(b"".join(path.read_bytes() for path in RENDER_SOURCES)).hexdigest()
+
+# 📥 所有圖表需要的統計值（資料表沒有新期數時直接讀取結果快取）
+@cached_result()
+def collect_chart_data(windows=DEFAULT_WINDOWS, last_draws=TIMELINE_DRAWS, matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
+
+    odd = int(np.count_nonzero(matrix.numbers & 1))
+    timelines = {}
+    for window in windows:
+        timeline = get_hot_and_cold_timeline(window=window, matrix=matrix)
+        timelines[window] = (timeline["dates"][-last_draws:], timeline["counts"][-last_draws:])
+    return {
+        "number_counts": matrix.incidence.sum(axis=0),
+        "tail_counts": np.bincount((matrix.numbers % 10).ravel(), minlength=10),
+        "segment_counts": np.bincount(get_segments(matrix.numbers).ravel(), minlength=5)[1:],
+        "odd": odd,
+        "even": matrix.numbers.size - odd,
+        "timelines": timelines,  # 視窗 → (日期, (last_draws, 39) 出現次數)
+    }
+
+# 🖼️ 各圖表的 Figure 建構函式（只吃已整理好的輸入值，不讀資料表、不碰 pyplot）
+def build_hot_number_figure(labels, values):
+    return bar_figure(labels, values, "熱門號碼（前十）", "號碼", "出現次數")
+
+def build_tail_digit_figure(values):
+    return bar_figure(np.arange(10), values, "尾數分布", "尾數 (0~9)", "出現次數")
+
+def build_range_segment_figure(values):
+    return bar_figure(["01–10", "11–20", "21–30", "31–39"], values, "號碼區間分布", "區間", "出現次數")
+
+def build_odd_even_figure(odd, even):
+    return pie_figure([odd, even], ["奇數", "偶數"], "奇偶數比例", startangle=140)
+
+def build_timeline_figure(window, dates, counts):
+    return timeline_figure(dates, counts, window)
+
+CHART_BUILDERS = {
+    "hot_numbers": build_hot_number_figure,
+    "tail_digits": build_tail_digit_figure,
+    "range_segments": build_range_segment_figure,
+    "odd_even": build_odd_even_figure,
+    "timeline": build_timeline_figure,
+}
+
+# 📋 圖表工作：(圖檔名, 建構函式名稱, 輸入值)，輸入值同時決定內容雜湊
+def hot_number_task(data, top_n=10):
+    counts = data["number_counts"]
+    top = np.argsort(-counts, kind="stable")[:top_n]
+    return "hot_numbers.png", "hot_numbers", {"labels": top + 1, "values": counts[top]}
+
+def tail_digit_task(data):
+    return "tail_digits.png", "tail_digits", {"values": data["tail_counts"]}
+
+def range_segment_task(data):
+    return "range_segments.png", "range_segments", {"values": data["segment_counts"]}
+
+def odd_even_task(data):
+    return "odd_even_ratio.png", "odd_even", {"odd": data["odd"], "even": data["even"]}
+
+def timeline_task(data, window):
+    dates, counts = data["timelines"][window]
+    return f"hot_cold_timeline_{window}.png", "timeline", {"window": window, "dates": dates, "counts": counts}
+
+def chart_tasks(data, windows=DEFAULT_WINDOWS):
+    tasks = [hot_number_task(data), tail_digit_task(data), range_segment_task(data), odd_even_task(data)]
+    return tasks + [timeline_task(data, window) for window in windows if window in data["timelines"]]
+
+# 🔑 內容雜湊：建構函式名稱與程式碼（含標題等常數）+ 共用繪圖程式版本 + 輸入值
+#    改了資料、畫法或樣式都會重新輸出
+def chart_hash(kind, inputs):
+    digest = hashlib.sha256()
+    digest.update(kind.encode())
+    digest.update(code_digest(CHART_BUILDERS[kind].__code__).digest())
+    digest.update(RENDER_VERSION.encode())
+    for name, value in sorted(inputs.items()):
+        digest.update(name.encode())
+        if isinstance(value, np.ndarray):
+            # 不用 pickle：同內容的陣列可能因物件共用方式不同而序列化出不同位元組
+            digest.update(f"{value.dtype.str}{value.shape}".encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+def load_manifest():
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest):
+    tmp_path = MANIFEST_PATH.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, MANIFEST_PATH)
+
+# 🎨 繪製並儲存單張圖表（可在子行程中執行）
+def render_task(task):
+    filename, kind, inputs = task
+    fig = CHART_BUILDERS[kind](**inputs)
+    fig.savefig(IMG_DIR / filename)
+    return filename
+
+# 🚀 輸出圖表：略過內容雜湊未變且檔案仍在的圖，其餘以行程池平行繪製
+def render_charts(tasks, workers=None, force=False):
+    manifest = load_manifest()
+    pending, skipped = [], []
+    for task in tasks:
+        filename, kind, inputs = task
+        digest = chart_hash(kind, inputs)
+        if not force and manifest.get(filename) == digest and (IMG_DIR / filename).exists():
+            skipped.append(filename)
+        else:
+            pending.append((task, digest))
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(render_task, [task for task, _ in pending]))
+    else:
+        rendered = [render_task(task) for task, _ in pending]
+
+    if pending:
+        manifest.update({task[0]: digest for task, digest in pending})
+        save_manifest(manifest)
+    return rendered, skipped
 
 # 🔥 熱號柱狀圖
-def generate_hot_number_chart(top_n=10):
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        numbers = [n for row in cursor.fetchall() for n in row]
-
-    counter = Counter(numbers).most_common(top_n)
-    labels, values = zip(*counter)
-
-    plt.figure()
-    plt.bar(labels, values)
-    plt.title("熱門號碼（前十）")
-    plt.xlabel("號碼")
-    plt.ylabel("出現次數")
-    plt.tight_layout()
-    plt.savefig(IMG_DIR / "hot_numbers.png")
-    plt.close()
+def generate_hot_number_chart(top_n=10, matrix=None, data=None):
+    data = data or collect_chart_data(matrix=matrix)
+    render_charts([hot_number_task(data, top_n)], workers=1)
 
 # 🧠 尾數分布圖
-def generate_tail_digit_chart():
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        numbers = [n for row in cursor.fetchall() for n in row]
-
-    tails = [n % 10 for n in numbers]
-    counter = Counter(tails)
-    labels, values = zip(*sorted(counter.items()))
-
-    plt.figure()
-    plt.bar(labels, values)
-    plt.title("尾數分布")
-    plt.xlabel("尾數 (0~9)")
-    plt.ylabel("出現次數")
-    plt.tight_layout()
-    plt.savefig(IMG_DIR / "tail_digits.png")
-    plt.close()
+def generate_tail_digit_chart(matrix=None, data=None):
+    data = data or collect_chart_data(matrix=matrix)
+    render_charts([tail_digit_task(data)], workers=1)
 
 # 📊 區間分布圖
-def generate_range_segment_chart():
-    def segment(num):
-        if 1 <= num <= 10: return "01–10"
-        if 11 <= num <= 20: return "11–20"
-        if 21 <= num <= 30: return "21–30"
-        if 31 <= num <= 39: return "31–39"
-
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        numbers = [n for row in cursor.fetchall() for n in row]
-
-    segment_counter = Counter(segment(n) for n in numbers)
-    labels, values = zip(*segment_counter.items())
-
-    plt.figure()
-    plt.bar(labels, values)
-    plt.title("號碼區間分布")
-    plt.xlabel("區間")
-    plt.ylabel("出現次數")
-    plt.tight_layout()
-    plt.savefig(IMG_DIR / "range_segments.png")
-    plt.close()
+def generate_range_segment_chart(matrix=None, data=None):
+    data = data or collect_chart_data(matrix=matrix)
+    render_charts([range_segment_task(data)], workers=1)
 
 # ⚖️ 奇偶比例圓餅圖
-def generate_odd_even_pie_chart():
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT no1, no2, no3, no4, no5 FROM lotto539")
-        numbers = [n for row in cursor.fetchall() for n in row]
-
-    odd = sum(1 for n in numbers if n % 2 == 1)
-    even = sum(1 for n in numbers if n % 2 == 0)
-
-    plt.figure()
-    plt.pie([odd, even], labels=["奇數", "偶數"], autopct='%1.1f%%', startangle=140)
-    plt.title("奇偶數比例")
-    plt.axis("equal")
-    plt.savefig(IMG_DIR / "odd_even_ratio.png")
-    plt.close()
+def generate_odd_even_pie_chart(matrix=None, data=None):
+    data = data or collect_chart_data(matrix=matrix)
+    render_charts([odd_even_task(data)], workers=1)
+
+# 🌡️ 視窗熱度時間軸（近 last_draws 期，每期往前 window 期的出現次數）
+def generate_hot_cold_timeline_chart(window=100, last_draws=TIMELINE_DRAWS, matrix=None, data=None):
+    if data is None or window not in data["timelines"]:
+        data = collect_chart_data(windows=(window,), last_draws=last_draws, matrix=matrix)
+    render_charts([timeline_task(data, window)], workers=1)
 
 # 🚀 主程式
-if __name__ == "__main__":
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="產出今彩539 統計圖表")
+    parser.add_argument("--workers", type=int, default=None, help="平行繪圖的行程數（預設為 CPU 核心數，1 為不使用行程池）")
+    parser.add_argument("--force", action="store_true", help="忽略內容雜湊，重新輸出所有圖表")
+    args = parser.parse_args(argv)
     print("📊 產生圖表中...")
 
-    generate_hot_number_chart()
-    generate_tail_digit_chart()
-    generate_range_segment_chart()
-    generate_odd_even_pie_chart()
+    # 一次取得所有圖表的統計值（資料未更新時不需讀取資料表）
+    data = collect_chart_data()
+    rendered, skipped = render_charts(chart_tasks(data), workers=args.workers, force=args.force)
 
+    print(f"🖼️ 重新輸出 {len(rendered)} 張，內容未變略過 {len(skipped)} 張")
     print(f"✅ 所有圖表已儲存至：{IMG_DIR}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# 📦 匯入模組
+from io import BytesIO
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# 🖼️ 以物件導向 API 建立圖表（不經過 pyplot 全域狀態，可在多執行緒 / 多行程中安全使用）
+#    每個函式只負責畫圖並回傳 Figure，資料由呼叫端準備
+
+
+# 🧱 建立掛在 Agg 畫布上的 Figure
+def new_figure(figsize=None):
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+# 💾 Figure → PNG / SVG 位元組（不寫入磁碟）
+def figure_to_bytes(fig, fmt="png", dpi=100):
+    buffer = BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=dpi)
+    return buffer.getvalue()
+
+
+# 📊 柱狀圖
+def bar_figure(labels, values, title, xlabel=None, ylabel=None, figsize=None):
+    fig = new_figure(figsize)
+    ax = fig.subplots()
+    ax.bar(labels, values)
+    ax.set_title(title)
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    if ylabel:
+        ax.set_ylabel(ylabel)
+    fig.tight_layout()
+    return fig
+
+
+# 🥧 圓餅圖
+def pie_figure(values, labels, title, startangle=90):
+    fig = new_figure()
+    ax = fig.subplots()
+    ax.pie(values, labels=labels, autopct="%1.1f%%", startangle=startangle)
+    ax.set_title(title)
+    ax.axis("equal")
+    return fig
+
+
+# 🌡️ 附數字的熱力圖（values 為 (列, 欄) 整數陣列）
+def heatmap_figure(values, row_labels, column_labels, title, figsize=(16, 8)):
+    import seaborn as sns
+
+    fig = new_figure(figsize)
+    ax = fig.subplots()
+    sns.heatmap(values, annot=True, fmt="d", cmap="YlGnBu", cbar=True, linewidths=.5, linecolor='gray',
+                xticklabels=column_labels, yticklabels=row_labels, ax=ax)
+    ax.set_title(title)
+    return fig
+
+
+# 📈 單一號碼的歷史間隔趨勢
+def gap_trend_figure(gap_list, target_number):
+    fig = new_figure((10, 4))
+    ax = fig.subplots()
+    ax.plot(range(1, len(gap_list) + 1), gap_list, marker='o', linestyle='-')
+    ax.set_title(f"號碼 {target_number:02d} 的歷史間隔趨勢")
+    ax.set_xlabel("出現次數（由近到遠）")
+    ax.set_ylabel("間隔期數")
+    ax.grid(True)
+    fig.tight_layout()
+    return fig
+
+
+# ♻️ 可重複使用的間隔趨勢畫布：只建立一次 Figure / Axes / 折線，之後每個號碼只更新資料
+class GapTrendCanvas:
+    def __init__(self, figsize=(10, 4)):
+        self.figure = new_figure(figsize)
+        self.ax = self.figure.subplots()
+        (self.line,) = self.ax.plot([], [], marker='o', linestyle='-')
+        self.ax.set_xlabel("出現次數（由近到遠）")
+        self.ax.set_ylabel("間隔期數")
+        self.ax.grid(True)
+        # 以兩位數刻度與同長度的標題先排版一次（預留標題空間），之後不需每張圖重算 tight_layout
+        self.ax.set_ylim(0, 99)
+        self.ax.set_title(self.title_text(0))
+        self.figure.tight_layout()
+        self.ax.autoscale(True)
+
+    def update(self, gap_list, target_number):
+        self.line.set_data(np.arange(1, len(gap_list) + 1), gap_list)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.set_title(self.title_text(target_number))
+        return self.figure
+
+    @staticmethod
+    def title_text(target_number):
+        return f"號碼 {target_number:02d} 的歷史間隔趨勢"
+
+    # 目前畫面的 RGBA 像素（拼接圖用）
+    def to_rgba(self):
+        self.figure.canvas.draw()
+        return np.asarray(self.figure.canvas.buffer_rgba()).copy()
+
+
+# 🌡️ 視窗熱度時間軸（counts 為 (期數, 39)，每期往前 window 期的出現次數）
+def timeline_figure(dates, counts, window):
+    fig = new_figure((14, 8))
+    ax = fig.subplots()
+    image = ax.imshow(counts.T, aspect="auto", cmap="YlOrRd", interpolation="nearest")
+    fig.colorbar(image, ax=ax, label=f"近 {window} 期出現次數")
+    ticks = np.linspace(0, len(dates) - 1, num=min(8, len(dates)), dtype=int)
+    ax.set_xticks(ticks, [str(dates[i]) for i in ticks], rotation=30)
+    ax.set_yticks(np.arange(39), [f"{n:02d}" for n in range(1, 40)], fontsize=7)
+    ax.set_title(f"號碼熱度時間軸（視窗 {window} 期）")
+    ax.set_xlabel("開獎日期")
+    ax.set_ylabel("號碼")
+    ax.grid(False)
+    fig.tight_layout()
+    return fig
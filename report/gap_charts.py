@@ -0,0 +1,110 @@
+# 📦 匯入模組
+import os
+import sys
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+CHART_DIR = BASE_DIR / "charts"  # 與 plot_gap_trend 相同的輸出位置
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import MAX_NUMBER
+from analyzer.gap_analysis import analyze_all_gaps
+from report.style import apply_global_matplotlib_style
+apply_global_matplotlib_style()
+from report.figures import GapTrendCanvas
+
+SPRITE_COLUMNS = 3
+
+
+# 📜 全部號碼的間隔序列（由近到遠），一次由間隔總表切出
+def gap_series(table, numbers=None):
+    numbers = numbers or range(1, MAX_NUMBER + 1)
+    return [(number, table.history(number)) for number in numbers]
+
+
+# 🖼️ 以同一張畫布依序輸出一批號碼的 PNG（可在子行程中執行）
+def _export_chunk(series, out_dir):
+    canvas = GapTrendCanvas()
+    paths = []
+    for number, history in series:
+        path = Path(out_dir) / f"gap_{number:02d}.png"
+        canvas.update(history, number).savefig(path)
+        paths.append(path)
+    return paths
+
+
+# 🗂️ 輸出每個號碼一張 PNG：號碼平均分給各行程，每個行程只建立一張畫布
+def export_gap_pngs(series, out_dir=CHART_DIR, workers=None):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = min(workers or os.cpu_count() or 1, len(series))
+    if workers <= 1:
+        return _export_chunk(series, out_dir)
+
+    chunks = [series[i::workers] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_export_chunk, chunks, [out_dir] * workers)
+    return sorted(path for paths in results for path in paths)
+
+
+# 📄 輸出單一多頁 PDF（每個號碼一頁）
+def export_gap_pdf(series, pdf_path):
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    canvas = GapTrendCanvas()
+    Path(pdf_path).parent.mkdir(parents=True, exist_ok=True)
+    with PdfPages(pdf_path) as pdf:
+        for number, history in series:
+            pdf.savefig(canvas.update(history, number))
+    return Path(pdf_path)
+
+
+# 🧩 輸出拼接圖：每張圖畫到同一張畫布後取像素，依序排進 columns 欄的格子
+def export_gap_sprite(series, image_path, columns=SPRITE_COLUMNS):
+    from matplotlib.image import imsave
+
+    canvas = GapTrendCanvas()
+    tiles = []
+    for number, history in series:
+        canvas.update(history, number)
+        tiles.append(canvas.to_rgba())
+    height, width, depth = tiles[0].shape
+    rows = -(-len(tiles) // columns)
+    sheet = np.full((rows * height, columns * width, depth), 255, dtype=np.uint8)
+    for i, tile in enumerate(tiles):
+        row, col = divmod(i, columns)
+        sheet[row * height:(row + 1) * height, col * width:(col + 1) * width] = tile
+
+    Path(image_path).parent.mkdir(parents=True, exist_ok=True)
+    imsave(image_path, sheet)
+    return Path(image_path)
+
+
+# 🚀 主程式
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="批次輸出 39 個號碼的間隔趨勢圖")
+    parser.add_argument("--format", choices=["png", "pdf", "sprite"], default="png",
+                        help="png：每號一張；pdf：單一多頁 PDF；sprite：單張拼接圖")
+    parser.add_argument("--output", default=None, help="輸出目錄（png）或檔案路徑（pdf / sprite）")
+    parser.add_argument("--workers", type=int, default=None, help="PNG 平行輸出的行程數（預設為 CPU 核心數）")
+    args = parser.parse_args(argv)
+
+    series = gap_series(analyze_all_gaps())
+    if args.format == "png":
+        paths = export_gap_pngs(series, args.output or CHART_DIR, args.workers)
+        print(f"📈 已輸出 {len(paths)} 張間隔趨勢圖至：{paths[0].parent}")
+    elif args.format == "pdf":
+        path = export_gap_pdf(series, args.output or CHART_DIR / "gap_trends.pdf")
+        print(f"📄 間隔趨勢 PDF 已儲存：{path}")
+    else:
+        path = export_gap_sprite(series, args.output or CHART_DIR / "gap_trends.png")
+        print(f"🧩 間隔趨勢拼接圖已儲存：{path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,65 +1,184 @@
 # 📦 匯入模組
+import os
+import sys
+import argparse
 from fpdf import FPDF
 from pathlib import Path
 from datetime import datetime
+import numpy as np
 
 # 📁 全域變數
 BASE_DIR = Path(__file__).resolve().parent
 REPORT_DIR = BASE_DIR / "reports"
 REPORT_DIR.mkdir(exist_ok=True)
+CHART_DIR = BASE_DIR / "charts"  # 圖表流程（chart_generator）的輸出目錄，這裡只讀取不重畫
 TODAY = datetime.today().strftime("%Y-%m-%d")
 REPORT_PATH = REPORT_DIR / f"lotto539_report_{TODAY}.pdf"
+FONT_FAMILY = "JhengHei"
+FONT_FILE = "msjh.ttc"  # 與每週號碼報表相同的中文字型（微軟正黑體）
+FONT_ENV = "LOTTO539_FONT_PATH"  # 可指定中文字型檔的完整路徑（非 Windows 或字型不在系統目錄時）
+FONT_INDEX = 0  # .ttc 字型集合中的第幾個字型（msjh.ttc 的 0 為一般字重）
+if str(BASE_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR.parent))
+from analyzer.draw_matrix import load_draw_matrix, WEEKDAY_NAMES
+from analyzer.range_segment import get_segments
+from analyzer.bitmask import consecutive_pairs
+from analyzer.result_cache import cached_result
+
+SEGMENT_LABELS = ["01–10", "11–20", "21–30", "31–39"]
+
+# 🔤 找出中文字型檔的完整路徑：環境變數 → reportlab 的字型搜尋路徑（每週報表即由此找到）→ %WINDIR%\Fonts
+#    fpdf2 只會開啟給定的路徑，不會自行搜尋系統字型目錄
+def find_font_path(font_file=FONT_FILE):
+    candidates = [Path(os.environ[FONT_ENV])] if os.environ.get(FONT_ENV) else []
+    try:
+        from reportlab import rl_config
+        candidates += [Path(folder) / font_file for folder in rl_config.TTFSearchPath]
+    except ImportError:
+        pass
+    candidates.append(Path(os.environ.get("WINDIR", r"C:\Windows")) / "Fonts" / font_file)
+    for path in candidates:
+        if path.is_file():
+            return path.resolve()
+    raise FileNotFoundError(
+        f"找不到中文字型 {font_file}，請安裝微軟正黑體，或以環境變數 {FONT_ENV} 指定字型檔的完整路徑"
+    )
 
 # 🖨️ PDF 產生類別
 class LottoPDF(FPDF):
+    def __init__(self, font_path=None):
+        super().__init__()
+        font_path = font_path or find_font_path()
+        # 中文需使用 Unicode 字型；同一字型檔註冊為一般 / 粗體 / 斜體
+        for style in ("", "B", "I"):
+            self.add_font(FONT_FAMILY, style, str(font_path), collection_font_number=FONT_INDEX)
+
     def header(self):
-        self.set_font("Arial", "B", 16)
+        self.set_font(FONT_FAMILY, "B", 16)
         self.cell(0, 10, "今彩539 分析報告", ln=True, align="C")
-        self.set_font("Arial", "", 12)
+        self.set_font(FONT_FAMILY, "", 12)
         self.cell(0, 10, f"產出日期：{TODAY}", ln=True, align="C")
         self.ln(5)
 
     def footer(self):
         self.set_y(-15)
-        self.set_font("Arial", "I", 10)
+        self.set_font(FONT_FAMILY, "I", 10)
         self.cell(0, 10, f"第 {self.page_no()} 頁", align="C")
 
     def section_title(self, title):
-        self.set_font("Arial", "B", 14)
+        self.set_font(FONT_FAMILY, "B", 14)
         self.set_text_color(0, 0, 128)
         self.cell(0, 10, title, ln=True)
         self.set_text_color(0, 0, 0)
 
     def section_body(self, lines):
-        self.set_font("Arial", "", 12)
+        self.set_font(FONT_FAMILY, "", 12)
         for line in lines:
             self.cell(0, 8, line, ln=True)
         self.ln(5)
 
-# 🧾 模擬內容填入（可替換成真實分析結果）
-def get_sample_sections():
-    return [
-        ("熱門號碼（前5）", ["號碼 17 ➜ 184 次", "號碼 29 ➜ 181 次", "號碼 23 ➜ 178 次"]),
-        ("冷門號碼（後5）", ["號碼 36 ➜ 121 次", "號碼 04 ➜ 119 次", "號碼 10 ➜ 118 次"]),
-        ("奇偶比例", ["奇數：52.3%", "偶數：47.7%"]),
-        ("尾數分布", ["尾數 3 ➜ 139 次", "尾數 7 ➜ 130 次", "尾數 9 ➜ 124 次"]),
-        ("連號期數", ["含連號的期數共 689 期"]),
-        ("區間分布", ["01–10：872 次", "11–20：993 次", "21–30：1502 次", "31–39：1633 次"]),
-        ("星期分布", ["星期一：203 期", "星期五：198 期"])
-    ]
+    # 🖼️ 嵌入已產出的圖表（置中，寬度 120mm）
+    def section_image(self, image_path, width=120):
+        self.image(str(image_path), x=(self.w - width) / 2, w=width)
+        self.ln(5)
+
+# 🧮 彙總值：名稱 → 由開獎矩陣計算的函式（各段落只宣告需要哪些，建構時只算用得到的）
+AGGREGATES = {
+    "total_draws": lambda m: len(m),
+    "number_counts": lambda m: m.incidence.sum(axis=0),
+    "odd_count": lambda m: int(np.count_nonzero(m.numbers & 1)),
+    "number_total": lambda m: int(m.numbers.size),
+    "tail_counts": lambda m: np.bincount((m.numbers % 10).ravel(), minlength=10),
+    "consecutive_draws": lambda m: int(np.count_nonzero(consecutive_pairs(m.masks))),
+    "segment_counts": lambda m: np.bincount(get_segments(m.numbers).ravel(), minlength=5)[1:],
+    "weekday_draws": lambda m: np.bincount(m.weekdays, minlength=7),
+}
+
+# 📥 一次讀取開獎矩陣，計算指定的彙總值（資料表沒有新期數時直接讀取結果快取）
+#    AGGREGATES 位於本模組，其餘用到的計算函式列於 depends，改動時快取一併失效
+@cached_result(depends=("analyzer.draw_matrix", "analyzer.range_segment", "analyzer.bitmask"))
+def collect_aggregates(names, matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
+    return {name: AGGREGATES[name](matrix) for name in names}
+
+# 📝 各段落內容：(彙總值) → 文字列
+def hot_number_lines(agg):
+    order = np.argsort(-agg["number_counts"], kind="stable")
+    return [f"號碼 {i + 1:02d} ➜ {agg['number_counts'][i]} 次" for i in order[:5]]
+
+def cold_number_lines(agg):
+    order = np.argsort(agg["number_counts"], kind="stable")
+    return [f"號碼 {i + 1:02d} ➜ {agg['number_counts'][i]} 次" for i in order[:5]]
+
+def odd_even_lines(agg):
+    total = agg["number_total"] or 1
+    odd_ratio = agg["odd_count"] / total * 100
+    return [f"奇數：{odd_ratio:.1f}%", f"偶數：{100 - odd_ratio:.1f}%"]
+
+def tail_digit_lines(agg):
+    order = np.argsort(-agg["tail_counts"], kind="stable")
+    return [f"尾數 {t} ➜ {agg['tail_counts'][t]} 次" for t in order[:3]]
+
+def consecutive_lines(agg):
+    return [f"含連號的期數共 {agg['consecutive_draws']} 期（總期數 {agg['total_draws']} 期）"]
+
+def segment_lines(agg):
+    return [f"{label}：{count} 次" for label, count in zip(SEGMENT_LABELS, agg["segment_counts"])]
+
+def weekday_lines(agg):
+    return [f"{WEEKDAY_NAMES[i]}：{count} 期" for i, count in enumerate(agg["weekday_draws"]) if count > 0]
+
+# 📋 報表段落：(標題, 需要的彙總值, 內容函式, 嵌入的圖表檔名或 None)
+SECTIONS = [
+    ("熱門號碼（前5）", ("number_counts",), hot_number_lines, "hot_numbers.png"),
+    ("冷門號碼（後5）", ("number_counts",), cold_number_lines, None),
+    ("奇偶比例", ("odd_count", "number_total"), odd_even_lines, "odd_even_ratio.png"),
+    ("尾數分布", ("tail_counts",), tail_digit_lines, "tail_digits.png"),
+    ("連號期數", ("consecutive_draws", "total_draws"), consecutive_lines, None),
+    ("區間分布", ("segment_counts",), segment_lines, "range_segments.png"),
+    ("星期分布", ("weekday_draws",), weekday_lines, None),
+]
+
+# 🧱 建構段落：彙總所有段落需要的值後只計算一次，再交給各段落排版
+def build_sections(sections=SECTIONS, matrix=None):
+    names = tuple(sorted({name for _, required, _, _ in sections for name in required}))
+    agg = collect_aggregates(names, matrix=matrix)
+    built = []
+    for title, _, provider, chart_name in sections:
+        chart_path = CHART_DIR / chart_name if chart_name else None
+        built.append((title, provider(agg), chart_path if chart_path and chart_path.exists() else None))
+    return built
 
 # 📝 產生 PDF 主函式
-def generate_pdf_report():
-    pdf = LottoPDF()
-    pdf.add_page()
+def generate_pdf_report(sections=SECTIONS, report_path=REPORT_PATH, matrix=None):
+    pdf = LottoPDF()  # 先載入字型，找不到時在計算前就失敗
+    built = build_sections(sections, matrix=matrix)
+    missing = [title for (title, _, _, chart_name), (_, _, path) in zip(sections, built) if chart_name and path is None]
+    if missing:
+        print(f"⚠️ 找不到圖表（請先執行 charts 指令）：{'、'.join(missing)}")
 
-    for title, content in get_sample_sections():
+    pdf.add_page()
+    for title, lines, chart_path in built:
         pdf.section_title(title)
-        pdf.section_body(content)
+        pdf.section_body(lines)
+        if chart_path:
+            pdf.section_image(chart_path)
 
-    pdf.output(str(REPORT_PATH))
-    print(f"✅ PDF 已產出：{REPORT_PATH}")
+    pdf.output(str(report_path))
+    print(f"✅ PDF 已產出：{report_path}")
 
 # 🚀 主程式
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="產出今彩539 分析 PDF 報告")
+    parser.add_argument("--output", default=str(REPORT_PATH), help="PDF 輸出路徑")
+    args = parser.parse_args(argv)
+    try:
+        generate_pdf_report(report_path=Path(args.output))
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
 if __name__ == "__main__":
-    generate_pdf_report()
+    sys.exit(main())
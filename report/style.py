@@ -1,7 +1,5 @@
 # 📦 匯入模組
 import matplotlib
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
 
 # 🖋️ 全域視覺樣式設定
 # style.py
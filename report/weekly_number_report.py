@@ -1,24 +1,27 @@
 # 📦 匯入模組
-import sqlite3
-from collections import defaultdict
+import os
+import sys
+import json
+import hashlib
+import argparse
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from reportlab.lib.pagesizes import A4, landscape
+import numpy as np
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-
-# ✅ 註冊中文字型
-pdfmetrics.registerFont(TTFont("JhengHei", "msjh.ttc"))
 
 # 📁 全域路徑
 BASE_DIR = Path(__file__).resolve().parent.parent
-DB_PATH = BASE_DIR / "lotto539.db"
 REPORT_DIR = BASE_DIR / "reports"
 REPORT_DIR.mkdir(exist_ok=True)
 PDF_PATH = REPORT_DIR / f"weekly_number_summary_{datetime.now().strftime('%Y%m%d')}.pdf"
+BATCH_DIR = REPORT_DIR / "batch"  # 批次模式輸出：batch/weekly、batch/monthly（累計模式為 batch/weekly_cumulative 等）
+# 🧬 報表程式版本：本模組原始碼雜湊（版面、欄寬、字型或排版程式改動時，批次 PDF 一併重新產出）
+REPORT_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import load_draw_matrix, build_prefix, NUMBERS_PER_DRAW, MAX_NUMBER
+from analyzer.result_cache import cached_result
 
 # 📅 對應星期中文
 WEEKDAY_MAP = {
@@ -31,6 +34,26 @@ WEEKDAY_MAP = {
     "星期日": "日"
 }
 
+WEEKDAY_LABELS = list(WEEKDAY_MAP.values())  # 索引與開獎矩陣的 weekdays 相同（0=一 … 6=日）
+
+# 🧾 報表列：(標籤, 加總的星期索引)，每列都是星期 × 號碼矩陣的列加總
+REPORT_LAYOUT = [
+    ("一", [0]),
+    ("二", [1]),
+    ("一、二加總", [0, 1]),
+    ("三", [2]),
+    ("四", [3]),
+    ("三、四加總", [2, 3]),
+    ("五", [4]),
+    ("六", [5]),
+    ("日", [6]),
+    ("五、六、日加總", [4, 5, 6]),
+    ("一到日所有加總", list(range(7))),
+    ("總計(驗證)", list(range(7))),
+]
+# (報表列數, 7) 選取矩陣：一次矩陣乘法得到所有報表列
+LAYOUT_SELECTOR = np.array([[int(i in weekdays) for i in range(len(WEEKDAY_LABELS))] for _, weekdays in REPORT_LAYOUT])
+
 ALL_NUMBERS = [f"{i:02d}" for i in range(1, 40)]
 SECTION_COLORS = {
     "一": colors.Color(0.85, 0.88, 0.95),
@@ -47,47 +70,70 @@ SECTION_COLORS = {
     "Count(驗證)": colors.Color(0.85, 0.92, 0.98)
 }
 
-# 📊 撈資料
-def collect_weekday_number_counts():
-    stats = {label: defaultdict(int) for label in WEEKDAY_MAP.values()}
-    with sqlite3.connect(DB_PATH) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT weekday, no1, no2, no3, no4, no5, draw_date FROM lotto539 ORDER BY draw_date")
-        rows = cursor.fetchall()
-        for row in rows:
-            wd = WEEKDAY_MAP.get(row[0], "")
-            for num in row[1:6]:
-                stats[wd][f"{num:02d}"] += 1
-        last_date = rows[-1][-1] if rows else "N/A"
-    return stats, last_date
-
-# 🧮 建構報表資料
-def build_report_rows(stats):
-    def sum_rows(keys):
-        combined = defaultdict(int)
-        for key in keys:
-            for k, v in stats[key].items():
-                combined[k] += v
-        return combined
-    rows = [
-        ("一", stats["一"]),
-        ("二", stats["二"]),
-        ("一、二加總", sum_rows(["一", "二"])),
-        ("三", stats["三"]),
-        ("四", stats["四"]),
-        ("三、四加總", sum_rows(["三", "四"])),
-        ("五", stats["五"]),
-        ("六", stats["六"]),
-        ("日", stats["日"]),
-        ("五、六、日加總", sum_rows(["五", "六", "日"])),
-    ]
-    total = sum_rows(["一", "二", "三", "四", "五", "六", "日"])
-    rows.append(("一到日所有加總", total))
-    rows.append(("總計(驗證)", total))
-    return rows
+# 📊 星期 × 號碼 (7, 39) 出現次數：以開獎矩陣一次 np.add.at 累加（資料表沒有新期數時直接讀取結果快取）
+@cached_result()
+def collect_weekday_number_counts(matrix=None):
+    if matrix is None:
+        matrix = load_draw_matrix()
+
+    counts = np.zeros((len(WEEKDAY_LABELS), MAX_NUMBER), dtype=np.int64)
+    np.add.at(counts, (np.repeat(matrix.weekdays, NUMBERS_PER_DRAW), matrix.numbers.ravel().astype(np.intp) - 1), 1)
+    last_date = str(matrix.dates[-1]) if len(matrix) else "N/A"
+    return counts, last_date
+
+# ➕ (N+1, 7, 39) 星期 × 號碼累計出現次數；任意期數區間 [a, b) 的報表矩陣 = prefix[b] - prefix[a]
+def weekday_number_prefix(matrix):
+    if "weekday_number_prefix" not in matrix.derived:
+        weekday_hits = matrix.weekdays[:, None] == np.arange(len(WEEKDAY_LABELS))
+        matrix.derived["weekday_number_prefix"] = build_prefix(weekday_hits[:, :, None] & matrix.incidence[:, None, :])
+    return matrix.derived["weekday_number_prefix"]
+
+# 🧮 建構報表資料：[(標籤, (39,) 出現次數), ...]
+def build_report_rows(counts):
+    return [(label, row) for (label, _), row in zip(REPORT_LAYOUT, LAYOUT_SELECTOR @ counts)]
+
+# ✅ 註冊中文字型（讀取字型檔較慢，產出 PDF 前才註冊，且只註冊一次）
+def register_fonts():
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    if "JhengHei" not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont("JhengHei", "msjh.ttc"))
+
+# 📐 欄寬與表格樣式只依報表列標籤而定：同一行程內建立一次後重複使用
+@lru_cache(maxsize=None)
+def table_layout(labels):
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.platypus import TableStyle
+
+    label_max_width = max(len(label) for label in labels)
+    base_widths = [min(15, max(11, label_max_width * 1.3))] + [12] * len(ALL_NUMBERS)
+    total_width = landscape(A4)[0] - 18  # 左右邊界 9pt + 9pt
+    scale = total_width / sum(base_widths)
+    col_widths = [w * scale for w in base_widths]
+
+    style = TableStyle([
+        ('FONTNAME', (0, 0), (-1, -1), 'JhengHei'),
+        ('FONTSIZE', (0, 0), (-1, -1), 6.5),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.whitesmoke),
+        ('BOX', (0, 0), (-1, -1), 1.2, colors.black),
+        ('INNERGRID', (0, 0), (-1, -1), 1.2, colors.black),
+    ])
+    for idx, label in enumerate(labels, start=1):
+        bg = SECTION_COLORS.get(label)
+        if bg:
+            style.add('BACKGROUND', (0, idx), (-1, idx), bg)
+    return sum(base_widths), total_width, col_widths, style
 
 # 🖨️ 輸出 PDF
-def generate_pdf(rows, last_date, debug=False):
+def generate_pdf(rows, last_date, debug=False, pdf_path=PDF_PATH):
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    register_fonts()
     styles = getSampleStyleSheet()
     styles['Title'].fontName = 'JhengHei'
     styles.add(ParagraphStyle(name='SmallJhengHei', fontName='JhengHei', fontSize=7, leading=8, alignment=1))
@@ -112,45 +158,171 @@ def generate_pdf(rows, last_date, debug=False):
             wrapped_text = label
 
         wrapped_label = Paragraph(wrapped_text, styles['SmallJhengHei'])
-        row = [wrapped_label] + [str(row_data.get(n, 0)) for n in ALL_NUMBERS]
+        row = [wrapped_label] + [str(int(count)) for count in row_data]
         data.append(row)
 
-    label_max_width = max(len(Paragraph(label, styles['SmallJhengHei']).getPlainText()) for label, _ in rows)
-    col_widths = [min(15, max(11, label_max_width * 1.3))] + [12] * len(ALL_NUMBERS)
-    if debug:
-        print(f"[DEBUG] 初始總欄寬: {sum(col_widths):.2f} pt")
-    total_width = landscape(A4)[0] - 18  # 左右邊界 9pt + 9pt
-    scale = total_width / sum(col_widths)
-    col_widths = [w * scale for w in col_widths]
+    base_width, total_width, col_widths, style = table_layout(tuple(label for label, _ in rows))
     if debug:
+        print(f"[DEBUG] 初始總欄寬: {base_width:.2f} pt")
         print(f"[DEBUG] 縮放後總欄寬: {sum(col_widths):.2f} / 可用寬度: {total_width:.2f} pt")
         if sum(col_widths) > total_width:
             print("[WARNING] 表格總寬超出 A4 可用範圍，請縮小字體或欄寬")
 
     table = Table(data, colWidths=col_widths, repeatRows=1, hAlign='LEFT')
-    style = TableStyle([
-        ('FONTNAME', (0, 0), (-1, -1), 'JhengHei'),
-        ('FONTSIZE', (0, 0), (-1, -1), 6.5),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.whitesmoke),
-        ('BOX', (0, 0), (-1, -1), 1.2, colors.black),
-        ('INNERGRID', (0, 0), (-1, -1), 1.2, colors.black),
-    ])
-    for idx, (label, _) in enumerate(rows, start=1):
-        bg = SECTION_COLORS.get(label)
-        if bg:
-            style.add('BACKGROUND', (0, idx), (-1, idx), bg)
     table.setStyle(style)
     table._argW = col_widths
     content.append(table)
 
-    doc = SimpleDocTemplate(str(PDF_PATH), pagesize=landscape(A4), leftMargin=9, rightMargin=9, topMargin=6, bottomMargin=6)
+    doc = SimpleDocTemplate(str(pdf_path), pagesize=landscape(A4), leftMargin=9, rightMargin=9, topMargin=6, bottomMargin=6)
     doc.build(content)
 
+# 📆 切分區間：回傳 [(起日, 迄日), ...]（weekly 以星期一起算，monthly 以每月 1 日起算，迄日含當天）
+def split_periods(start_date, end_date, granularity):
+    start, end = np.datetime64(start_date, "D"), np.datetime64(end_date, "D")
+    if granularity == "weekly":
+        # 1970-01-01 為星期四，往前推 3 天對齊星期一
+        first = start - (start - np.datetime64("1969-12-29")).astype(np.int64) % 7
+        starts = np.arange(first, end + 1, 7)
+        ends = starts + 6
+    else:
+        months = np.arange(start.astype("datetime64[M]"), end.astype("datetime64[M]") + 1)
+        starts = months.astype("datetime64[D]")
+        ends = (months + 1).astype("datetime64[D]") - 1
+    # 頭尾區間裁切到指定日期範圍內
+    return list(zip(np.maximum(starts, start), np.minimum(ends, end)))
+
+# 🏷️ 批次模式名稱（用於輸出目錄與檔名，累計與一般區間的報表不互相覆蓋）
+def batch_mode(granularity, cumulative=False):
+    return f"{granularity}_cumulative" if cumulative else granularity
+
+# 🧮 各區間的報表工作：由累計索引相減取得 7 × 39 矩陣，不需重新查詢資料表
+def batch_report_jobs(matrix, periods, granularity, cumulative=False, out_dir=BATCH_DIR):
+    prefix = weekday_number_prefix(matrix)
+    period_starts = np.array([start for start, _ in periods], dtype="datetime64[D]")
+    period_ends = np.array([end for _, end in periods], dtype="datetime64[D]")
+    lower = np.searchsorted(matrix.dates, period_starts, side="left")
+    upper = np.searchsorted(matrix.dates, period_ends, side="right")
+
+    jobs = []
+    for (start, end), a, b in zip(periods, lower, upper):
+        if a == b:
+            continue  # 該區間沒有開獎（春節休市等）
+        counts = prefix[b] - (0 if cumulative else prefix[a])
+        first_date = matrix.dates[0] if cumulative else matrix.dates[a]
+        date_text = f"{first_date} ～ {matrix.dates[b - 1]}"
+        name = f"{batch_mode(granularity, cumulative)}_number_summary_{str(start).replace('-', '')}_{str(end).replace('-', '')}.pdf"
+        jobs.append((Path(out_dir) / name, date_text, counts))
+    return jobs
+
+# 🔑 報表內容雜湊（報表程式版本 + 區間文字 + 矩陣內容），用於略過已是最新的 PDF
+def report_hash(date_text, counts):
+    digest = hashlib.sha256(REPORT_VERSION.encode())
+    digest.update(date_text.encode())
+    digest.update(np.ascontiguousarray(counts, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+# 🖨️ 產出單一區間的 PDF（可在子行程中執行）
+def render_report_job(job):
+    pdf_path, date_text, counts = job
+    generate_pdf(build_report_rows(counts), date_text, pdf_path=pdf_path)
+    return pdf_path
+
+# 🗂️ 批次產出：內容雜湊與 manifest 相同且檔案仍在者略過，其餘以行程池平行輸出
+def generate_batch_reports(jobs, out_dir=BATCH_DIR, workers=None, force=False):
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / "report_hashes.json"
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
+
+    pending, skipped = [], 0
+    for job in jobs:
+        digest = report_hash(job[1], job[2])
+        if not force and manifest.get(job[0].name) == digest and job[0].exists():
+            skipped += 1
+        else:
+            pending.append((job, digest))
+
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(render_report_job, [job for job, _ in pending], chunksize=8))
+    else:
+        for job, _ in pending:
+            render_report_job(job)
+
+    if pending:
+        manifest.update({job[0].name: digest for job, digest in pending})
+        tmp_path = manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, manifest_path)
+    return len(pending), skipped
+
+# 🚀 批次模式主流程
+def run_batch(args):
+    matrix = load_draw_matrix()
+    if not len(matrix):
+        print("⚠️ 資料庫沒有開獎資料")
+        return 1
+
+    start = args.start or str(matrix.dates[0])
+    end = args.end or str(matrix.dates[-1])
+    out_dir = Path(args.output_dir) if args.output_dir else BATCH_DIR / batch_mode(args.batch, args.cumulative)
+    periods = split_periods(start, end, args.batch)
+    jobs = batch_report_jobs(matrix, periods, args.batch, cumulative=args.cumulative, out_dir=out_dir)
+    print(f"📆 {start} ～ {end}：{len(periods)} 個區間，其中 {len(jobs)} 個有開獎資料")
+
+    rendered, skipped = generate_batch_reports(jobs, out_dir, workers=args.workers, force=args.force)
+    print(f"[INFO] 產出 {rendered} 份 PDF，已是最新略過 {skipped} 份：{out_dir}")
+    return 0
+
+# 📅 命令列日期格式檢查（YYYY-MM-DD）
+def iso_date(text):
+    try:
+        return datetime.strptime(text, "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日期格式應為 YYYY-MM-DD：{text}")
+
 # 🚀 主程式
-if __name__ == "__main__":
-    stats, last_date = collect_weekday_number_counts()
-    rows = build_report_rows(stats)
-    generate_pdf(rows, last_date, debug=True)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="產出每週號碼統計 PDF 報表")
+    parser.add_argument("--quiet", action="store_true", help="不顯示欄寬除錯訊息")
+    parser.add_argument("--batch", choices=["weekly", "monthly"], default=None,
+                        help="批次模式：依週 / 月為每個區間各產出一份 PDF")
+    parser.add_argument("--start", type=iso_date, default=None, help="批次起始日期 YYYY-MM-DD（預設為第一期）")
+    parser.add_argument("--end", type=iso_date, default=None, help="批次結束日期 YYYY-MM-DD（預設為最新一期）")
+    parser.add_argument("--cumulative", action="store_true", help="批次模式改為統計第一期至各區間結束日的累計次數")
+    parser.add_argument("--output-dir", default=None, help="批次輸出目錄（預設 reports/batch/<週期>，累計模式為 reports/batch/<週期>_cumulative）")
+    parser.add_argument("--workers", type=int, default=None, help="批次平行輸出的行程數（預設為 CPU 核心數）")
+    parser.add_argument("--force", action="store_true", help="批次模式忽略內容雜湊，全部重新產出")
+    args = parser.parse_args(argv)
+
+    batch_only = {
+        "--start": args.start is not None,
+        "--end": args.end is not None,
+        "--cumulative": args.cumulative,
+        "--output-dir": args.output_dir is not None,
+        "--workers": args.workers is not None,
+        "--force": args.force,
+    }
+    used = [flag for flag, given in batch_only.items() if given]
+    if used and not args.batch:
+        parser.error(f"{'、'.join(used)} 只能搭配 --batch 使用")
+    if args.start and args.end and args.start > args.end:
+        parser.error(f"--start {args.start} 晚於 --end {args.end}")
+
+    if args.batch:
+        return run_batch(args)
+
+    counts, last_date = collect_weekday_number_counts()
+    rows = build_report_rows(counts)
+    generate_pdf(rows, last_date, debug=not args.quiet)
     print(f"[INFO] PDF 已產出：{PDF_PATH}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
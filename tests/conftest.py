@@ -0,0 +1,29 @@
+# 📦 匯入模組
+import sys
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import WEEKDAY_NAMES
+
+
+# 🎲 產生 count 期隨機開獎列（與 DRAW_COLUMNS_SQL 相同欄位順序），期別與日期依序遞增
+def random_rows(count, seed=539, first_period=113001, first_date=date(2024, 1, 1)):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        day = first_date + timedelta(days=i)
+        numbers = rng.sample(range(1, 40), 5)
+        rows.append((str(first_period + i), day.isoformat(), WEEKDAY_NAMES[day.weekday()], *numbers))
+    return rows
+
+
+@pytest.fixture
+def make_rows():
+    return random_rows
@@ -0,0 +1,44 @@
+# 📦 匯入模組
+import sys
+import random
+from pathlib import Path
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import build_draw_matrix
+from analyzer.combination_scoring import COMBINATION_TOTAL, score_all_combinations
+
+
+# 🎯 排容反推的中 3 / 4 / 5 碼期數與逐期集合交集一致
+def test_hit_counts_match_set_intersection(make_rows):
+    rows = make_rows(30)
+    # 加入重複期與只差一碼的期，確保 4 碼、5 碼命中都有出現
+    first = rows[0]
+    rows.append(("113031", "2024-01-31", "星期三", *first[3:]))
+    rows.append(("113032", "2024-02-01", "星期四", *first[3:7], next(n for n in range(1, 40) if n not in first[3:])))
+    scores = score_all_combinations(build_draw_matrix(rows))
+    assert len(scores["hits_3plus"]) == COMBINATION_TOTAL
+
+    rng = random.Random(11)
+    tickets = [row[3:] for row in rows] + [rng.sample(range(1, 40), 5) for _ in range(200)]
+    draws = [set(row[3:]) for row in rows]
+    for ticket in tickets:
+        matches = [len(draw & set(ticket)) for draw in draws]
+        score = scores.for_ticket(ticket)
+        assert score["hits_3plus"] == sum(m >= 3 for m in matches)
+        assert score["hits_4plus"] == sum(m >= 4 for m in matches)
+        assert score["hits_5"] == sum(m == 5 for m in matches)
+
+    assert scores.for_ticket(first[3:])["hits_5"] == 2
+
+
+# 📐 組合本身的特徵（和、奇數、連號、最大間距）
+def test_ticket_features(make_rows):
+    scores = score_all_combinations(build_draw_matrix(make_rows(5)))
+    score = scores.for_ticket((3, 4, 5, 20, 39))
+    assert score["sum"] == 71
+    assert score["odd"] == 3
+    assert score["consecutive"] == 2
+    assert score["max_gap"] == 19
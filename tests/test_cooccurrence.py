@@ -0,0 +1,65 @@
+# 📦 匯入模組
+import sys
+from collections import Counter
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.draw_matrix import build_draw_matrix
+from analyzer.cooccurrence import TRIPLE_NUMBERS, build_cooccurrence, combination_rank
+
+
+def brute_force_counts(rows, k):
+    return Counter(combo for row in rows for combo in combinations(sorted(row[3:]), k))
+
+
+# 🔢 colex 編號與還原表互為反函數，且涵蓋 0 ~ C(39,3)-1
+def test_combination_rank_round_trip():
+    ranks = combination_rank(TRIPLE_NUMBERS)
+    assert np.array_equal(ranks, np.arange(len(TRIPLE_NUMBERS)))
+    assert combination_rank((1, 2, 3)) == 0
+    assert tuple(TRIPLE_NUMBERS[-1]) == (37, 38, 39)
+
+
+# 🤝 兩碼 / 三碼同期次數與逐期列舉一致
+def test_pair_and_triple_counts_match_brute_force(make_rows):
+    rows = make_rows(60)
+    counts = build_cooccurrence(build_draw_matrix(rows))
+    pairs, triples = brute_force_counts(rows, 2), brute_force_counts(rows, 3)
+
+    for a, b in combinations(range(1, 40), 2):
+        assert counts.pair_count(a, b) == pairs[(a, b)]
+    for combo, expected in triples.items():
+        assert counts.triple_count(*combo) == expected
+    assert int(counts.triple_counts.sum()) == sum(triples.values())
+
+
+# 🔥 前 k 名的次數與逐期列舉排序後相同，且回傳的組合確實是該次數
+def test_top_pairs_and_triples(make_rows):
+    rows = make_rows(80)
+    counts = build_cooccurrence(build_draw_matrix(rows))
+    for top, expected in ((counts.top_pairs(10), brute_force_counts(rows, 2)),
+                          (counts.top_triples(10), brute_force_counts(rows, 3))):
+        assert [count for _, count in top] == sorted(expected.values(), reverse=True)[:10]
+        assert all(expected[combo] == count for combo, count in top)
+
+
+# ➕ 增量 update 與整段重算相同；日期區間只計入區間內的期數
+def test_update_and_date_range(make_rows):
+    rows = make_rows(40)
+    matrix = build_draw_matrix(rows)
+    counts = build_cooccurrence(build_draw_matrix(rows[:25]))
+    counts.update(matrix.numbers[25:])
+    full = build_cooccurrence(matrix)
+    assert counts.total_draws == full.total_draws == 40
+    assert np.array_equal(counts.pair_counts, full.pair_counts)
+    assert np.array_equal(counts.triple_counts, full.triple_counts)
+
+    ranged = build_cooccurrence(matrix, rows[10][1], rows[19][1])
+    assert ranged.total_draws == 10
+    assert np.array_equal(ranged.triple_counts, build_cooccurrence(build_draw_matrix(rows[10:20])).triple_counts)
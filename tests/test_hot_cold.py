@@ -0,0 +1,19 @@
+# 📦 匯入模組
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.rolling_window import rank_hot_and_cold
+
+
+# 🔥 熱號 / 冷號遇到同次數時都由小號碼排起
+def test_rank_ties_put_smaller_numbers_first():
+    counts = np.array([[3, 1, 1, 5, 1, 3]])
+    hot, cold = rank_hot_and_cold(counts, top_n=3)
+    assert hot.tolist() == [[4, 1, 6]]
+    assert cold.tolist() == [[2, 3, 5]]
@@ -0,0 +1,64 @@
+# 📦 匯入模組
+import sys
+import sqlite3
+from pathlib import Path
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from database.init_db import ensure_schema, sync_draw_numbers, verify_query_plans
+from database.query import QUERY_PLAN_CHECKS
+
+
+# 🔎 ensure_schema 建立的新資料庫上，常用查詢都應走預期索引且不需暫存排序
+def test_query_plans_use_indexes(tmp_path):
+    with sqlite3.connect(tmp_path / "lotto539.db") as conn:
+        ensure_schema(conn)
+        assert verify_query_plans(conn, QUERY_PLAN_CHECKS) == []
+
+
+# 🔄 舊資料庫（只有原始欄位）遷移後也應通過同樣的檢查
+def test_query_plans_after_migration(tmp_path):
+    with sqlite3.connect(tmp_path / "lotto539.db") as conn:
+        conn.execute("""
+            CREATE TABLE lotto539 (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                period TEXT UNIQUE NOT NULL,
+                draw_date TEXT NOT NULL,
+                weekday TEXT NOT NULL,
+                no1 INTEGER NOT NULL, no2 INTEGER NOT NULL, no3 INTEGER NOT NULL,
+                no4 INTEGER NOT NULL, no5 INTEGER NOT NULL,
+                remark TEXT DEFAULT ''
+            )
+        """)
+        conn.execute(
+            "INSERT INTO lotto539 (period, draw_date, weekday, no1, no2, no3, no4, no5) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ("113001", "2024-01-02", "星期二", 3, 11, 17, 25, 39),
+        )
+        ensure_schema(conn)
+        assert conn.execute("SELECT draw_day FROM lotto539").fetchone()[0] == 19724
+        assert verify_query_plans(conn, QUERY_PLAN_CHECKS) == []
+
+
+# 🔢 draw_seq 依開獎日期編號：追加新期數往後接續，補入較早期數時全部重編
+def test_draw_seq_follows_draw_date(tmp_path):
+    insert_sql = "INSERT INTO lotto539 (period, draw_date, weekday, no1, no2, no3, no4, no5) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    seq_sql = """
+        SELECT l.period, d.draw_seq FROM draw_numbers d JOIN lotto539 l ON l.id = d.draw_id
+        WHERE d.position = 1 ORDER BY d.draw_seq
+    """
+    with sqlite3.connect(tmp_path / "lotto539.db") as conn:
+        ensure_schema(conn)
+        conn.execute(insert_sql, ("113002", "2024-01-03", "星期三", 1, 2, 3, 4, 5))
+        conn.execute(insert_sql, ("113003", "2024-01-04", "星期四", 1, 2, 3, 4, 6))
+        sync_draw_numbers(conn)
+        assert conn.execute(seq_sql).fetchall() == [("113002", 0), ("113003", 1)]
+
+        conn.execute(insert_sql, ("113004", "2024-01-05", "星期五", 1, 2, 3, 4, 7))
+        sync_draw_numbers(conn)
+        assert conn.execute(seq_sql).fetchall() == [("113002", 0), ("113003", 1), ("113004", 2)]
+
+        conn.execute(insert_sql, ("113001", "2024-01-02", "星期二", 1, 2, 3, 4, 8))
+        sync_draw_numbers(conn)
+        assert conn.execute(seq_sql).fetchall() == [("113001", 0), ("113002", 1), ("113003", 2), ("113004", 3)]
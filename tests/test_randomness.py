@@ -0,0 +1,25 @@
+# 📦 匯入模組
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from analyzer.randomness import holm_adjust
+
+
+# 📐 Holm 校正：依序乘上 m, m-1, …，再取累計最大值並截在 1
+def test_holm_adjust_matches_step_down():
+    adjusted = holm_adjust([0.01, 0.04, 0.03, 0.005])
+    assert np.allclose(adjusted, [0.03, 0.06, 0.06, 0.02])
+    assert np.allclose(holm_adjust([0.5, 0.9]), [1.0, 1.0])
+
+
+# 🎲 均勻分布的 39 個 p 值，校正後幾乎不會有號碼被標為顯著
+def test_holm_adjust_controls_familywise_error():
+    rng = np.random.default_rng(539)
+    flagged = [np.count_nonzero(holm_adjust(rng.uniform(size=39)) < 0.05) > 0 for _ in range(2000)]
+    assert np.mean(flagged) <= 0.07
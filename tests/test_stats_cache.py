@@ -0,0 +1,69 @@
+# 📦 匯入模組
+import sys
+import sqlite3
+from collections import Counter
+from pathlib import Path
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+from database.init_db import ensure_schema
+from analyzer.draw_matrix import build_draw_matrix
+from analyzer.stats_cache import compute_statistics, refresh_stats_cache
+
+INSERT_SQL = "INSERT INTO lotto539 (period, draw_date, weekday, no1, no2, no3, no4, no5) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+def create_db(path, rows):
+    with sqlite3.connect(path) as conn:
+        ensure_schema(conn)
+        conn.executemany(INSERT_SQL, rows)
+
+
+def insert_rows(path, rows):
+    with sqlite3.connect(path) as conn:
+        conn.executemany(INSERT_SQL, rows)
+
+
+# 🔄 增量納入新期數的結果應與整份重建相同
+def test_incremental_refresh_matches_full_rebuild(tmp_path, make_rows):
+    db_path = tmp_path / "lotto539.db"
+    rows = make_rows(40)
+    create_db(db_path, rows[:25])
+    assert refresh_stats_cache(db_path) == compute_statistics(build_draw_matrix(rows[:25]))
+
+    insert_rows(db_path, rows[25:])
+    stats = refresh_stats_cache(db_path)
+    assert stats == compute_statistics(build_draw_matrix(rows))
+    assert stats == refresh_stats_cache(db_path)  # 沒有新期數時直接讀取
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT last_period, row_count FROM stats_cache").fetchone() == (rows[-1][0], 40)
+
+
+# 🧾 補登較早期別時，期數對不上應整份重建
+def test_backfilled_period_triggers_rebuild(tmp_path, make_rows):
+    db_path = tmp_path / "lotto539.db"
+    rows = make_rows(30)
+    create_db(db_path, rows[10:])
+    refresh_stats_cache(db_path)
+
+    insert_rows(db_path, rows[:10])
+    assert refresh_stats_cache(db_path) == compute_statistics(build_draw_matrix(rows))
+
+
+# 🔢 計數器與逐期逐號的直接計算一致
+def test_statistics_match_brute_force(make_rows):
+    rows = make_rows(50)
+    stats = compute_statistics(build_draw_matrix(rows))
+    numbers = [n for row in rows for n in row[3:]]
+    counter = Counter(numbers)
+
+    assert stats["total_rows"] == 50
+    assert stats["number_counts"] == [counter[n] for n in range(1, 40)]
+    assert stats["odd"] == sum(n % 2 for n in numbers)
+    assert stats["tail_counts"] == [sum(1 for n in numbers if n % 10 == t) for t in range(10)]
+    consecutive = [sum(1 for n in row[3:] if n + 1 in row[3:]) for row in rows]
+    assert stats["consecutive_count"] == sum(consecutive)
+    assert stats["consecutive_distribution"] == [consecutive.count(k) for k in range(5)]
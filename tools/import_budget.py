@@ -0,0 +1,106 @@
+# 📦 匯入模組
+import sys
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+# 📁 全域設定
+BASE_DIR = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).resolve().parent / "import_budget.json"
+
+
+# ⏱️ 以 python -X importtime 匯入一次，回傳（累計毫秒, 已匯入模組集合）；缺少套件時回傳 None
+def measure_import(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BASE_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1]
+
+    # 每行格式：import time: self [us] | cumulative | imported package
+    cumulative, imported = None, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = (part.strip() for part in line.split("|"))
+        if not total.isdigit():
+            continue
+        imported.add(name)
+        if name == module:
+            cumulative = int(total) / 1000
+    return cumulative, imported
+
+
+# ⏱️ 本機基準：python -c pass 的最短耗時（毫秒），用來把預算換算成這台機器的速度
+def measure_baseline(repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], cwd=BASE_DIR, capture_output=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+# 🚫 是否匯入了禁止的模組（名稱本身或其子模組）
+def find_forbidden(imported, forbidden):
+    return sorted(name for name in imported for prefix in forbidden if name == prefix or name.startswith(prefix + "."))
+
+
+# 🚀 逐一量測進入點，回傳是否全部在預算內
+#    max_ms 為訂定預算那台機器上的毫秒數（當時的基準為 baseline_ms），依本機基準等比例換算
+#    無法匯入的進入點視為未通過；allow_missing=True 時才改為略過（例如刻意不裝 streamlit 的環境）
+def check_budget(budget, repeat=None, allow_missing=False):
+    repeat = repeat or budget.get("repeat", 3)
+    baseline = measure_baseline(max(repeat, 5))
+    scale = baseline / budget["baseline_ms"] if budget.get("baseline_ms") else 1.0
+    ok = True
+    print(f"⏱️ 匯入時間預算檢查（每個進入點量測 {repeat} 次取最小值）")
+    print(f"📏 本機基準 python -c pass：{baseline:.1f} ms，預算倍率 ×{scale:.2f}")
+    print("=" * 60)
+    for module, entry in budget["entries"].items():
+        timings, imported = [], set()
+        for _ in range(repeat):
+            elapsed, detail = measure_import(module)
+            if elapsed is None:
+                break
+            timings.append(elapsed)
+            imported |= detail
+
+        if not timings:
+            if allow_missing:
+                print(f"⚠️ {module:<30} 略過（無法匯入：{detail}）")
+            else:
+                ok = False
+                print(f"❌ {module:<30} 無法匯入：{detail}")
+            continue
+
+        elapsed = min(timings)
+        limit = entry["max_ms"] * scale
+        violations = find_forbidden(imported, entry.get("forbidden", []))
+        passed = elapsed <= limit and not violations
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {module:<30} {elapsed:8.1f} ms / 預算 {limit:.0f} ms")
+        if violations:
+            shown = ", ".join(violations[:5]) + ("…" if len(violations) > 5 else "")
+            print(f"   🚫 匯入了應延遲載入的模組：{shown}")
+    return ok
+
+
+# 🚀 主程式
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="檢查各進入點的匯入時間是否超出預算")
+    parser.add_argument("--budget", default=str(BUDGET_PATH), help="預算設定檔（JSON）")
+    parser.add_argument("--repeat", type=int, default=None, help="每個進入點量測次數")
+    parser.add_argument("--allow-missing", action="store_true", help="無法匯入的進入點只警告、不算失敗")
+    args = parser.parse_args(argv)
+
+    with open(args.budget, encoding="utf-8") as f:
+        budget = json.load(f)
+    return 0 if check_budget(budget, args.repeat, args.allow_missing) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())